@@ -5,6 +5,10 @@ Numerically approximate the gaussian error function
 by using trapezoidal integration. E(x) is evaluated for many values of
 x and plotted to obtain a plot of the Gaussian error function.
 
+Instead of integrating from 0 separately for every x, the running
+integral is tabulated once on a fine grid and E(x) is interpolated from
+the table.
+
 Leon Hostetler, Feb. 25, 2017
 
 USAGE: python gaussian_errfn.py
@@ -38,14 +42,38 @@ def E(x, N):
     return s
 
 
+def E_table(x, N):
+    """
+    This function computes the Gaussian error function E(x) for a
+    whole array of x-values in a single pass. The running trapezoidal
+    integral is built on N slices from 0 out to the largest |x| in each
+    direction, and E(x) is interpolated from that table.
+
+    This is a local stand-in for the Antiderivative class of
+    09_integration_modular/mymodule_integration.py, which uses simpson's
+    rule and Hermite interpolation instead.
+    """
+    t = np.linspace(0, np.max(np.abs(x)), N + 1)
+    w = t[1] - t[0]  # Width of each trapezoid
+    ft = f(t)
+
+    # Running sum of the trapezoid areas, so table[k] = E(t[k])
+    table = np.concatenate(([0.0], np.cumsum(0.5 * w * (ft[:-1] + ft[1:]))))
+
+    # The integrand is even, so E(-x) = -E(x)
+    return np.sign(x) * np.interp(np.abs(x), t, table)
+
+
 x = np.linspace(-5, 5, 100)
-y = []
 
-# With N = 4 trapezoids we already have accuracy of two
-# significant figures which is sufficient for plotting.
-# For each of the x-values defined above, compute E(x) and add to list y.
-for i in x:
-    y.append(E(i, 4))
+# The table has 1000 slices, so all 100 values cost a single pass
+# of 1001 evaluations and are much more accurate than four
+# trapezoids per point.
+y = E_table(x, 1000)
+
+# Spot-check the table against the direct trapezoidal integral, using the
+# same slice width (1000 slices out to 1, or 5000 slices out to 5)
+print("E(1) = ", E(1.0, 1000), ", table = ", E_table(np.array([1.0, 5.0]), 5000)[0], sep="")
 
 
 # Plot the results
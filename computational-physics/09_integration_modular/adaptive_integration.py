@@ -1,8 +1,8 @@
 #! /usr/bin/env python
 """
 Integrate a given function using the adaptive
-trapezoidal method as well as the adaptive Simpson's method. In both cases,
-the methods are imported from an external user-created module named
+trapezoidal method, the adaptive Simpson's method, and the globally
+adaptive Simpson's method. In all cases, the methods are imported from an external user-created module named
 mymodule_integration.
 
 Leon Hostetler, Mar. 7, 2017
@@ -11,7 +11,8 @@ USAGE: python adaptive_integration.py
 """
 
 from __future__ import division, print_function
-from mymodule_integration import integrate_trapz_adaptive, integrate_simpson_adaptive
+from mymodule_integration import integrate_trapz_adaptive, integrate_simpson_adaptive, \
+    integrate_global_adaptive
 import numpy as np
 
 
@@ -26,3 +27,7 @@ integrate_trapz_adaptive(f, 0, 1, 1e-6, True)
 
 print("\nAdaptive Simpson's Rule:")
 integrate_simpson_adaptive(f, 0, 1, 1e-6, True)
+
+print("\nGlobally Adaptive Simpson's Rule:")
+result = integrate_global_adaptive(f, 0, 1, 1e-6)
+print("I = ", result[0], ", Error = ", result[2], ", Evaluations = ", result[3], sep="")
@@ -3,6 +3,8 @@
 Compute the value of the gaussian integral.
 Since this integral is from negative infinity to infinity, we have to
 perform a change of variables so the new limits of integration are [0,1].
+The double exponential method handles the infinite range itself and
+integrates the original integrand directly.
 
 Leon Hostetler, Mar. 7, 2017
 
@@ -24,11 +26,20 @@ def f(x):
     """
     return (2/(1-x)**2)*np.exp(-(x/(1-x))**2)
 
+
+def g(x):
+    """
+    The original integrand e^{-x^2} over the whole real line.
+    """
+    return np.exp(-x**2)
+
 epsilon = 1e-15  # To prevent divide by zero errors in integrand
 
 trapz = mmi.integrate_trapz_adaptive(f, 0, 1-epsilon, 1e-10)
 simps = mmi.integrate_simpson_adaptive(f, 0, 1-epsilon, 1e-10)
 monte = mmi.integrate_monte_carlo(f, 0, 1, 100000)
+de = mmi.integrate_tanh_sinh(g, -np.inf, np.inf, 1e-10)
+vegas = mmi.integrate_vegas(lambda x: f(x[0]), 1, [[0, 1]], 10000)
 
 actual = np.sqrt(np.pi)
 
@@ -42,5 +53,11 @@ print("Error: ", np.abs(actual - trapz[0]), sep="")
 print("\nAdaptive Simpson's Rule:", simps[0])
 print("Error: ", np.abs(actual - simps[0]), sep="")
 
+print("\nDouble exponential (sinh-sinh) method:", de[0])
+print("Error: ", np.abs(actual - de[0]), ", Evaluations: ", de[3], sep="")
+
 print("\nMonte Carlo method (with N = 100,000):", monte)
 print("Error: ", np.abs(actual - monte), sep="")
+
+print("\nVEGAS Monte Carlo method (10 x 10,000 points):", vegas[0])
+print("Error: ", np.abs(actual - vegas[0]), ", Estimated error: ", vegas[1], sep="")
@@ -34,7 +34,10 @@ def cv(T):
 
     epsilon = 1e-15  # Can't divide by zero
 
-    integral = mmi.integrate_simpson(f, 0+epsilon, theta/T, 50)[0]
+    # All the temperatures are integrated together in one batched call
+    Ts = np.atleast_1d(T)
+    limits = np.column_stack((np.full(Ts.shape, 0+epsilon), theta/Ts))
+    integral = mmi.integrate_batch(f, limits, 50)[0].reshape(np.shape(T))
     CT = 9.0*V*rho*k*((T/theta)**3)*integral
 
     return CT
@@ -0,0 +1,191 @@
+#! /usr/bin/env python
+"""
+Benchmark the integration methods of mymodule_integration. The 1D rules
+(trapz, simpson, their adaptive versions, romberg, global adaptive, gauss,
+gauss-kronrod, tanh-sinh, and Monte Carlo with the random sampler only)
+are run over a catalog of 1D test integrands (polynomial, oscillatory,
+peaked, singular). The sampling methods (Monte Carlo with the random,
+sobol and halton samplers, stratified, MISER and VEGAS) are run over
+high-dimensional integrands. Every method is run at several accuracy
+settings, and for every run the wall time, the number of function
+evaluations, and the achieved error are recorded.
+
+Left out are integrate_batch and QuadraturePlan, which apply the trapz,
+simpson and gauss rules above to many integrals at once, and
+integrate_importance (needs a sampling density matched to each integrand),
+integrate_monte_carlo_parallel (the same estimate as the vectorized Monte
+Carlo, split over worker processes), and integrate_monte_carlo_converge
+(runs to a target error rather than a fixed budget).
+
+The results are written to integration_benchmark.csv, and a
+work-precision plot (error against function evaluations) of every
+integrand is saved to integration_benchmark.png.
+
+USAGE: python integration_benchmark.py
+"""
+
+from __future__ import division, print_function
+import mymodule_integration as mmi
+import matplotlib.pyplot as plt
+import numpy as np
+import time
+import csv
+
+
+class Counted:
+    """
+    Wrap an integrand and count how many points it is evaluated at.
+    Array arguments count one evaluation per element.
+    """
+
+    def __init__(self, f, points=np.size):
+        self.f = f
+        self.points = points
+        self.count = 0
+
+    def __call__(self, x):
+        self.count += self.points(x)
+        return self.f(x)
+
+
+#
+# The test integrands: name, kind, integrand, limits, exact value
+#
+
+integrands_1d = [
+    ("polynomial", "polynomial", lambda x: x**5 - 13*x**4 + 47*x**3 - 59*x**2 + 24*x,
+     0.0, 10.0, 5700.0),
+    ("cos(50x)", "oscillatory", lambda x: np.cos(50*x),
+     0.0, 1.0, np.sin(50)/50),
+    ("lorentzian", "peaked", lambda x: 1/(1e-4 + (x - 0.3)**2),
+     0.0, 1.0, (np.arctan(70) + np.arctan(30))/0.01),
+    ("1/sqrt(x)", "singular", lambda x: 1/np.sqrt(x),
+     0.0, 1.0, 2.0),
+]
+
+# High-dimensional integrands take points as an array of shape (dim, n)
+integrands_nd = [
+    ("gaussian 6D", "high-dimensional",
+     lambda x: np.exp(-np.sum(x**2, axis=0)), 6, (np.sqrt(np.pi)*0.8427007929497149)**6),
+    ("hypersphere 8D", "high-dimensional",
+     lambda x: np.sum(x**2, axis=0) <= 1, 8, np.pi**4/24),
+]
+
+#
+# The methods: name, function(f, a, b, setting) returning the integral,
+# and the settings (accuracy or number of points) to sweep over
+#
+
+tolerances = [1e-4, 1e-6, 1e-8, 1e-10]
+
+methods_1d = [
+    ("trapz", lambda f, a, b, N: mmi.integrate_trapz(f, a, b, N, vectorized=True)[0],
+     [10, 100, 1000, 10000, 100000]),
+    ("simpson", lambda f, a, b, N: mmi.integrate_simpson(f, a, b, N, vectorized=True)[0],
+     [10, 100, 1000, 10000, 100000]),
+    ("trapz adaptive", lambda f, a, b, tol: mmi.integrate_trapz_adaptive(f, a, b, tol, vectorized=True)[0],
+     tolerances),
+    ("simpson adaptive", lambda f, a, b, tol: mmi.integrate_simpson_adaptive(f, a, b, tol, vectorized=True)[0],
+     tolerances),
+    ("romberg", lambda f, a, b, tol: mmi.integrate_romberg(f, a, b, tol, vectorized=True)[0],
+     tolerances),
+    ("global adaptive", lambda f, a, b, tol: mmi.integrate_global_adaptive(f, a, b, tol)[0],
+     tolerances),
+    ("gauss", lambda f, a, b, N: mmi.integrate_gauss(f, a, b, N, vectorized=True)[0],
+     [5, 10, 20, 50, 100]),
+    ("gauss-kronrod", lambda f, a, b, tol: mmi.integrate_gauss_kronrod(f, a, b, tol, vectorized=True)[0],
+     tolerances),
+    ("tanh-sinh", lambda f, a, b, tol: mmi.integrate_tanh_sinh(f, a, b, tol, vectorized=True)[0],
+     tolerances),
+    ("monte carlo", lambda f, a, b, N: mmi.integrate_monte_carlo_vectorized(
+        lambda x: f(x[0]), 1, [[a, b]], N)[0],
+     [1000, 10000, 100000, 1000000]),
+]
+
+methods_nd = [
+    ("monte carlo", lambda f, dim, N: mmi.integrate_monte_carlo_vectorized(f, dim, [[-1, 1]]*dim, N)[0]),
+    ("sobol", lambda f, dim, N: mmi.integrate_monte_carlo_vectorized(f, dim, [[-1, 1]]*dim, N,
+                                                                    sampler="sobol")[0]),
+    ("halton", lambda f, dim, N: mmi.integrate_monte_carlo_vectorized(f, dim, [[-1, 1]]*dim, N,
+                                                                     sampler="halton")[0]),
+    ("stratified", lambda f, dim, N: mmi.integrate_stratified(f, dim, [[-1, 1]]*dim, N, 2)[0]),
+    ("miser", lambda f, dim, N: mmi.integrate_miser(f, dim, [[-1, 1]]*dim, N)[0]),
+    ("vegas", lambda f, dim, N: mmi.integrate_vegas(f, dim, [[-1, 1]]*dim, N // 10)[0]),
+]
+
+sizes_nd = [2**10, 2**13, 2**16, 2**19]
+
+
+def run(method, integrand, kind, setting, exact, call):
+    """
+    Time one call of an integration method and return its result row.
+    """
+    start = time.time()
+    with np.errstate(all="ignore"):
+        try:
+            I = call()
+        except (ValueError, OverflowError, ZeroDivisionError):
+            I = float("nan")
+    seconds = time.time() - start
+
+    return {"method": method, "integrand": integrand, "kind": kind,
+            "setting": setting, "value": I, "error": abs(I - exact),
+            "evaluations": None, "seconds": seconds}
+
+
+results = []
+
+for name, kind, f, a, b, exact in integrands_1d:
+    for method, integrate, settings in methods_1d:
+        for setting in settings:
+            g = Counted(f)
+            row = run(method, name, kind, setting, exact, lambda: integrate(g, a, b, setting))
+            row["evaluations"] = g.count
+            results.append(row)
+
+for name, kind, f, dim, exact in integrands_nd:
+    for method, integrate in methods_nd:
+        for N in sizes_nd:
+            g = Counted(f, lambda x: np.shape(x)[1])
+            row = run(method, name, kind, N, exact, lambda: integrate(g, dim, N))
+            row["evaluations"] = g.count
+            results.append(row)
+
+#
+# Write the results
+#
+
+fields = ["integrand", "kind", "method", "setting", "value", "error", "evaluations", "seconds"]
+with open("integration_benchmark.csv", "w") as datafile:
+    writer = csv.DictWriter(datafile, fieldnames=fields)
+    writer.writeheader()
+    for row in results:
+        writer.writerow(row)
+
+print("Wrote ", len(results), " runs to integration_benchmark.csv", sep="")
+
+#
+# Work-precision plots, one panel per integrand
+#
+
+names = [item[0] for item in integrands_1d] + [item[0] for item in integrands_nd]
+fig, axes = plt.subplots(2, 3, figsize=(15, 9))
+
+for ax, name in zip(axes.flat, names):
+    rows = [row for row in results if row["integrand"] == name]
+    for method in sorted(set(row["method"] for row in rows)):
+        points = [(row["evaluations"], row["error"]) for row in rows
+                  if row["method"] == method and np.isfinite(row["error"])]
+        if len(points) == 0:
+            continue
+        evaluations, errors = zip(*points)
+        errors = np.maximum(errors, 1e-17)     # Exact results still show on a log scale
+        ax.loglog(evaluations, errors, "o-", label=method)
+    ax.set_title(name)
+    ax.set_xlabel("Function evaluations")
+    ax.set_ylabel("Absolute error")
+    ax.legend(fontsize=7)
+
+plt.tight_layout()
+plt.savefig("integration_benchmark.png")
+plt.show()
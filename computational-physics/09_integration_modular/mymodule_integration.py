@@ -14,6 +14,25 @@ Symbols and parameters:
         For the monte carlo methods, N is the number of random points.
     'accuracy' is the minimum accuracy you want.
     'detailed' if 'True' prints detailed results during integration.
+    'vectorized' if 'True' evaluates f on whole arrays of nodes at once. The
+        function f must then accept a NumPy array and return an array.
+    'chunk' is the maximum number of nodes evaluated in one vectorized call.
+        This keeps the memory use bounded for very large N.
+    'limits' for the batched methods is an array of (lower, upper) pairs,
+        one pair per integral.
+    'maxeval' is the hard limit on the number of function evaluations.
+    'lower' and 'upper' may be -np.inf and np.inf for the tanh-sinh method.
+    'cachedir' for the gaussian methods is a directory where the sample
+        points and weights are saved, so they are computed only once.
+    'seed' for the parallel monte carlo method makes the result reproducible.
+    'workers' is the number of processes to spread the work over.
+    'sampler' selects the points for the monte carlo methods: "random" for
+        pseudo-random points, or "sobol" or "halton" for randomized
+        low-discrepancy (quasi-Monte Carlo) points.
+    'maxtime' is a time budget in seconds for the streaming monte carlo method.
+    'y' for the data methods is an array of samples, which may be a
+        memory-mapped file (see load_data), and 'x' the sample points, or
+        None for samples spaced evenly by 'dx'.
     'dim' for the multi-dimensional monte carlo method is the number of dimensions
     'limit' for the monte carlo method is the integration limits. E.g in the
         2D case, you would have your limits as [[-1, 1], [-1, 1]] if both inner
@@ -27,16 +46,44 @@ USAGE: To be used as a supplement to a main program.
 from __future__ import division, print_function
 import numpy.random as rnd
 import numpy as np
+import multiprocessing
+import heapq
+import tempfile
+import shutil
+import time
 import sys
+import os
 
 
-def integrate_trapz(f, lower, upper, N=1000):
+def sum_nodes(f, a, w, start, stop, step=1, chunk=100000):
+    """
+    Return the sum of f(a + i*w) for i in range(start, stop, step).
+
+    The nodes are built as NumPy arrays of at most 'chunk' points and f is
+    called once per chunk, so f must accept and return arrays. If a and w
+    are themselves arrays (one entry per integral), the node index runs
+    along a new leading axis and one sum is returned per entry.
+    """
+    s = 0.0
+    span = chunk * step     # Index range covered by one chunk
+    extra = (1,) * np.ndim(w)   # Broadcast the nodes against array limits
+    for i0 in range(start, stop, span):
+        i = np.arange(i0, min(i0 + span, stop), step).reshape((-1,) + extra)
+        s += np.sum(f(a + i * w), axis=0)
+
+    return s
+
+
+def integrate_trapz(f, lower, upper, N=1000, vectorized=False, chunk=100000):
     """
     Integrate the function from lower to upper using
     trapezoidal integration.
 
     Takes in the function, the lower and upper limits of integration,
     and the number of trapezoidal slices to use.
+
+    Send 'vectorized' with a value of 'True' to evaluate the interior
+    nodes in chunks of NumPy arrays instead of one at a time.
     """
     a = lower           # Lower integration limit
     b = upper           # Upper integration limit
@@ -46,30 +93,42 @@ def integrate_trapz(f, lower, upper, N=1000):
     I = 0.5 * f(a) * w + 0.5 * f(b) * w
 
     # Area of rest of trapezoids
-    for i in range(1, N):
-        I += f(a + i * w) * w
+    if vectorized is True:
+        I += sum_nodes(f, a, w, 1, N, 1, chunk) * w
+    else:
+        for i in range(1, N):
+            I += f(a + i * w) * w
 
     return I, N
 
 
-def integrate_simpson(f, lower, upper, N=1000):
+def integrate_simpson(f, lower, upper, N=1000, vectorized=False, chunk=100000):
     """
     Integrate the function from lower to upper using
     simpson integration.
 
     Takes in the function, the lower and upper limits of integration,
     and the number of slices to use.
+
+    Send 'vectorized' with a value of 'True' to evaluate the interior
+    nodes in chunks of NumPy arrays instead of one at a time.
     """
     a = lower           # Lower integration limit
     b = upper           # Upper integration limit
-    w = (b - a) / N     # Width of each trapezoid
 
     if N % 2 != 0:
         N += 1
         print("Number of slices was odd so 1 was added to N.")
 
+    w = (b - a) / N     # Width of each slice
+
     I = (1 / 3) * f(a) * w + (1 / 3) * f(b) * w  # Area of first and last trapezoids
 
+    if vectorized is True:
+        I += sum_nodes(f, a, w, 1, N, 2, chunk) * w * (4 / 3)   # Odd terms
+        I += sum_nodes(f, a, w, 2, N, 2, chunk) * w * (2 / 3)   # Even terms
+        return I, N
+
     for i in range(1, N, 2):  # Odd terms
         I += f(a + i * w) * w * (4 / 3)
 
@@ -79,22 +138,192 @@ def integrate_simpson(f, lower, upper, N=1000):
     return I, N
 
 
-def integrate_trapz_adaptive(f, lower, upper, accuracy=1e-8, detailed=False):
+class QuadraturePlan:
+    """Nodes and weights of a fixed-N quadrature rule, built once and reused."""
+
+    def __init__(self, rule, lower, upper, N=1000):
+        """
+        Build the plan for the rule "trapz", "simpson" or "gauss" with N
+        slices (N sample points for "gauss") on [lower, upper].
+        """
+        a = lower
+        b = upper
+
+        if rule == "trapz":
+            x = np.linspace(a, b, N + 1)
+            w = np.full(N + 1, (b - a) / N)
+            w[0] = w[-1] = 0.5 * (b - a) / N
+
+        elif rule == "simpson":
+            if N % 2 != 0:
+                N += 1
+                print("Number of slices was odd so 1 was added to N.")
+            x = np.linspace(a, b, N + 1)
+            w = np.full(N + 1, (2 / 3) * (b - a) / N)     # Even terms
+            w[1::2] = (4 / 3) * (b - a) / N                 # Odd terms
+            w[0] = w[-1] = (1 / 3) * (b - a) / N
+
+        elif rule == "gauss":
+            xg, wg = gaussxw(N)
+            x = 0.5 * (b - a) * xg + 0.5 * (b + a)
+            w = 0.5 * (b - a) * wg
+
+        else:
+            raise ValueError('Unknown rule "' + str(rule) + '", use "trapz", "simpson" or "gauss".')
+
+        self.rule = rule
+        self.N = N
+        self.x = np.ascontiguousarray(x, dtype=float)
+        self.w = np.ascontiguousarray(w, dtype=float)
+
+    def __call__(self, f):
+        """
+        Integrate f, which must accept the array of nodes. A list of
+        functions gives an array with one integral per function.
+        """
+        if isinstance(f, (list, tuple)):
+            return self.apply(np.array([fk(self.x) for fk in f]))
+
+        return self.apply(f(self.x))
+
+    def apply(self, values):
+        """
+        Integrate tabulated function values. The last axis of 'values'
+        runs over the nodes, so a matrix of values, one function per
+        row, gives one integral per row.
+        """
+        return np.dot(values, self.w)
+
+
+def cumulative_simpson(f, lower, upper, N=1000, initial=0.0):
+    """
+    Return the grid of N+1 evenly spaced points from lower to upper, the
+    running integral of f from lower to every point, starting from
+    'initial', and f at the grid points.
+
+    Each slice is integrated with simpson's rule using its midpoint, and
+    the slices are summed with a running sum, so the whole table costs a
+    single pass of 2N+1 evaluations. f must accept and return arrays.
+    """
+    x = np.linspace(lower, upper, N + 1)
+    w = (upper - lower) / N     # Width of each slice
+
+    fx = f(x)
+    fm = f(x[:-1] + 0.5 * w)    # Midpoints of the slices
+
+    F = np.empty(N + 1)
+    F[0] = initial
+    F[1:] = initial + np.cumsum(w / 6 * (fx[:-1] + 4 * fm + fx[1:]))
+
+    return x, F, fx
+
+
+class Antiderivative:
+    """Table of the integral of f from lower to x, evaluated for any x by interpolation."""
+
+    def __init__(self, f, lower, upper, N=1000, initial=0.0):
+        """
+        Tabulate the integral of f on N slices of [lower, upper] with
+        cumulative_simpson(). f must accept and return arrays.
+        """
+        # The derivative of the table is f itself, already evaluated on the grid
+        self.x, self.F, self.dFdx = cumulative_simpson(f, lower, upper, N, initial)
+
+    def __call__(self, x):
+        """
+        Return the integral from lower to x. Between the table points the
+        cubic Hermite interpolant through F and its derivative f is used,
+        which is as accurate as the simpson table itself.
+        """
+        x = np.asarray(x, dtype=float)
+        k = np.clip(np.searchsorted(self.x, x) - 1, 0, len(self.x) - 2)
+
+        h = self.x[k + 1] - self.x[k]
+        t = (x - self.x[k]) / h
+        h00 = (1 + 2 * t) * (1 - t)**2
+        h10 = t * (1 - t)**2
+        h01 = t**2 * (3 - 2 * t)
+        h11 = t**2 * (t - 1)
+
+        return (h00 * self.F[k] + h10 * h * self.dFdx[k]
+                + h01 * self.F[k + 1] + h11 * h * self.dFdx[k + 1])
+
+
+def integrate_batch(f, limits, N=1000, method="simpson", chunk=1000):
+    """
+    Integrate the function over many intervals at once.
+
+    Takes in the function, an array of (lower, upper) pairs, the number of
+    slices, and the rule to use ("trapz" or "simpson"). Every interval uses
+    the same N, so the k-th node of every integral is evaluated in a single
+    vectorized call of f. Like the other fixed-N rules, returns the
+    integral and N, where the integral is an array with one entry per pair.
+    """
+    limits = np.asarray(limits, dtype=float)
+    a = limits[:, 0]    # Lower integration limits
+    b = limits[:, 1]    # Upper integration limits
+
+    # The vectorized rules broadcast array limits node by node
+    if method == "trapz":
+        return integrate_trapz(f, a, b, N, vectorized=True, chunk=chunk)
+    elif method == "simpson":
+        return integrate_simpson(f, a, b, N, vectorized=True, chunk=chunk)
+
+    raise ValueError('Unknown method "' + str(method) + '", use "trapz" or "simpson".')
+
+
+def trapz_ladder(f, lower, upper, vectorized=False, chunk=100000):
+    """
+    Generate the trapezoidal estimates of the integral with N = 1, 2, 4, 8, ...
+    slices. Yields (N, I, evaluations) for each level.
+
+    The running sum of all the samples taken so far is kept between levels,
+    so each level only evaluates f at the N/2 new midpoints. 'evaluations'
+    is the total number of calls to f made so far.
+    """
+    a = lower       # Lower limit of integration
+    b = upper       # Upper limit of integration
+    N = 1           # Start with 1 trapezoid
+
+    s = 0.5 * (f(a) + f(b))     # Sum of the samples, endpoints weighted by 1/2
+    evaluations = 2
+    yield N, s * (b - a), evaluations
+
+    while True:
+        N *= 2              # Double the slices each level
+        w = (b - a) / N     # Width of each trapezoid
+
+        # Only the odd nodes are new, the even ones are already in s
+        if vectorized is True:
+            s += sum_nodes(f, a, w, 1, N, 2, chunk)
+        else:
+            for i in range(1, N, 2):
+                s += f(a + i * w)
+
+        evaluations += N // 2
+        yield N, s * w, evaluations
+
+
+def integrate_trapz_adaptive(f, lower, upper, accuracy=1e-8, detailed=False,
+                             vectorized=False):
     """
     Integrate the function from lower to upper using adaptive
     trapezoidal integration.
 
     Send the 'detailed' parameter with a value of 'True' if you
     want to print results for every N that is evaluated.
+
+    Returns the integral, the number of slices, the error estimate, and
+    the number of function evaluations.
     """
-    a = lower       # Lower limit of integration
-    b = upper       # Upper limit of integration
     Tol = accuracy  # Error tolerance
     error = 1       # Error needs to be initialized as something
-    N = 1           # Start with 1 trapezoid
+
+    ladder = trapz_ladder(f, lower, upper, vectorized)
 
     # I0 is the approximation with a single trapezoid
-    I0 = (f(a) + f(b))*(b-a)*0.5
+    N, I0, evaluations = next(ladder)
+    I = I0
 
     # Do you want detailed results?
     if detailed is True:
@@ -102,12 +331,7 @@ def integrate_trapz_adaptive(f, lower, upper, accuracy=1e-8, detailed=False):
 
     while error > Tol:      # Repeat until the error is less than the error tolerance
 
-        N *= 2              # Double the slices each iteration
-        w = (b - a)/N       # Width of each trapezoid
-
-        I = 0.5*I0
-        for i in range(1, N, 2):
-            I += f(a + i*w)*w
+        N, I, evaluations = next(ladder)    # Double the slices
 
         error = abs(I - I0)/3
 
@@ -117,25 +341,35 @@ def integrate_trapz_adaptive(f, lower, upper, accuracy=1e-8, detailed=False):
         if detailed is True:
             print("N = ", N, ", I = ", I, ", Error = ", error, sep="")
 
-    return I, N, error
+    return I, N, error, evaluations
 
 
-def integrate_simpson_adaptive(f, lower, upper, accuracy=1e-15, detailed=False):
+def integrate_simpson_adaptive(f, lower, upper, accuracy=1e-15, detailed=False,
+                               vectorized=False):
     """
     Integrate the function from lower to upper using adaptive
     simpson integration.
 
     Send the 'detailed' parameter with a value of 'True' if you
     want to print results for every N that is evaluated.
+
+    The simpson estimate with N slices is built from the trapezoidal
+    estimates with N and N/2 slices, S = (4*T_N - T_{N/2})/3, so no node
+    is ever evaluated twice.
+
+    Returns the integral, the number of slices, the error estimate, and
+    the number of function evaluations.
     """
-    a = lower       # Lower limit of integration
-    b = upper       # Upper limit of integration
     Tol = accuracy  # Error tolerance
     error = 1.0     # Error needs to be initialized as something
-    N = 1           # Start with 1 slice
 
-    # I0 is the approximation with a single slice
-    I0 = ((b-a)/6) * (f(a) + 4 * f((b - a)/2) + f(b))  # Area of first and last slice
+    ladder = trapz_ladder(f, lower, upper, vectorized)
+
+    # I0 is the approximation with two slices
+    T0 = next(ladder)[1]
+    N, T, evaluations = next(ladder)
+    I0 = (4 * T - T0) / 3
+    I = I0
 
     # Do you want detailed results?
     if detailed is True:
@@ -143,14 +377,10 @@ def integrate_simpson_adaptive(f, lower, upper, accuracy=1e-15, detailed=False):
 
     while error > Tol:
 
-        N *= 2
-        w = (b - a) / N  # Width of each slice
+        T0 = T
+        N, T, evaluations = next(ladder)    # Double the slices
 
-        I = 0.5 * I0
-        for i in range(1, N, 2):
-            I += -f(a + w * i) * w / 3
-        for i in range(0, N):
-            I += (2 / 3) * f(a + w * (i + 1 / 2)) * w
+        I = (4 * T - T0) / 3
 
         error = abs(I - I0)/15
 
@@ -160,10 +390,443 @@ def integrate_simpson_adaptive(f, lower, upper, accuracy=1e-15, detailed=False):
         if detailed is True:
             print("N = ", N, ", I = ", I, ", Error = ", error, sep="")
 
-    return I, N, error
+    return I, N, error, evaluations
+
+
+def integrate_romberg(f, lower, upper, accuracy=1e-10, detailed=False,
+                      vectorized=False):
+    """
+    Integrate the function from lower to upper using Romberg integration.
+
+    The trapezoidal estimates for N = 1, 2, 4, ... slices are extrapolated
+    with Richardson's method. Row i of the table holds R[i][0] = T_N and
+        R[i][m+1] = R[i][m] + (R[i][m] - R[i-1][m])/(4**(m+1) - 1)
+    and the last correction term is used as the error estimate.
+
+    Send the 'detailed' parameter with a value of 'True' if you
+    want to print the table row for every N that is evaluated.
+
+    Returns the integral, the number of slices, the error estimate, and
+    the number of function evaluations.
+    """
+    Tol = accuracy  # Error tolerance
+    error = 1.0     # Error needs to be initialized as something
+
+    ladder = trapz_ladder(f, lower, upper, vectorized)
+
+    N, I, evaluations = next(ladder)
+    R = [I]         # The latest row of the Romberg table
+
+    # Do you want detailed results?
+    if detailed is True:
+        print("N = ", N, ", R = ", R, sep="")
+
+    while error > Tol:
+
+        N, I, evaluations = next(ladder)    # Double the slices
+
+        row = [I]
+        for m in range(len(R)):
+            correction = (row[m] - R[m]) / (4**(m + 1) - 1)
+            row.append(row[m] + correction)
+
+        error = abs(correction)
+        R = row
+
+        # Do you want detailed results?
+        if detailed is True:
+            print("N = ", N, ", R = ", R, ", Error = ", error, sep="")
+
+    return R[-1], N, error, evaluations
+
+
+def simpson_interval(f, a, b, fa, fm, fb):
+    """
+    Return the heap entry for the interval [a, b], given f at both ends and
+    at the midpoint. The two quarter points are evaluated, and the one-slice
+    and two-slice simpson estimates are compared to estimate the error.
+    """
+    m = 0.5 * (a + b)
+    fl = f(0.5 * (a + m))   # Left quarter point
+    fr = f(0.5 * (m + b))   # Right quarter point
+
+    coarse = (b - a) / 6 * (fa + 4 * fm + fb)
+    fine = (b - a) / 12 * (fa + 4 * fl + 2 * fm + 4 * fr + fb)
+    error = abs(fine - coarse) / 15
+
+    # heapq pops the smallest entry, so the error is stored negated
+    return -error, a, b, fa, fl, fm, fr, fb, fine
+
+
+def integrate_global_adaptive(f, lower, upper, accuracy=1e-10, maxeval=100000,
+                              detailed=False):
+    """
+    Integrate the function from lower to upper using globally adaptive
+    simpson integration.
+
+    The subintervals are kept on a heap ordered by their error estimates.
+    Only the subinterval with the largest error is split in two, so the
+    work is spent where the integrand is rough. Splitting stops when the
+    total error is below 'accuracy' or when another split would exceed
+    'maxeval' function evaluations.
+
+    Returns the integral, the number of subintervals, the error estimate,
+    and the number of function evaluations.
+    """
+    a = lower       # Lower limit of integration
+    b = upper       # Upper limit of integration
+
+    heap = [simpson_interval(f, a, b, f(a), f(0.5 * (a + b)), f(b))]
+    evaluations = 5
+    error = -heap[0][0]
 
+    while error > accuracy and evaluations + 4 <= maxeval:
 
-def integrate_monte_carlo(f, lower, upper, N=100):
+        # Split the worst subinterval, its samples become the new midpoints
+        worst = heapq.heappop(heap)
+        a, b, fa, fl, fm, fr, fb = worst[1:8]
+        m = 0.5 * (a + b)
+        left = simpson_interval(f, a, m, fa, fl, fm)
+        right = simpson_interval(f, m, b, fm, fr, fb)
+        heapq.heappush(heap, left)
+        heapq.heappush(heap, right)
+        evaluations += 4
+
+        # Update the total error with the change from this split
+        error += worst[0] - left[0] - right[0]
+
+        # Do you want detailed results?
+        if detailed is True:
+            print("N = ", len(heap), ", Error = ", error, sep="")
+
+    I = sum(item[8] for item in heap)
+    error = -sum(item[0] for item in heap)  # Exact sum, free of update roundoff
+
+    return I, len(heap), error, evaluations
+
+
+# Sample points and weights already computed by gaussxw(), keyed by N
+gauss_cache = {}
+
+# Gauss-Kronrod 7/15 rule on [-1, 1]. The Kronrod points are symmetric,
+# only the non-negative ones are listed. The 7-point gauss rule uses the
+# odd-numbered Kronrod points (1, 3, 5, 7).
+kronrod_x = np.array([0.991455371120812639206854697526329,
+                      0.949107912342758524526189684047851,
+                      0.864864423359769072789712788640926,
+                      0.741531185599394439863864773280788,
+                      0.586087235467691130294144845693013,
+                      0.405845151377397166906606412076961,
+                      0.207784955007898467600689403773245,
+                      0.000000000000000000000000000000000])
+kronrod_w = np.array([0.022935322010529224963732008058970,
+                      0.063092092629978553290700663189204,
+                      0.104790010322250183839876322541518,
+                      0.140653259715525918745189590510238,
+                      0.169004726639267902826583426598550,
+                      0.190350578064785409913256402421014,
+                      0.204432940075298892414161999234649,
+                      0.209482141084727828012999174891714])
+gauss7_w = np.array([0.129484966168869693270611432679082,
+                     0.279705391489276667901467771423780,
+                     0.381830050505118944950369775488975,
+                     0.417959183673469387755102040816327])
+
+
+def gaussxw(N, cachedir=None):
+    """
+    Return the sample points and weights for N-point Gauss-Legendre
+    quadrature on [-1, 1].
+
+    The roots of the Legendre polynomial P_N are found with Newton's method,
+    starting from the approximation of Abramowitz and Stegun. The result is
+    stored in gauss_cache and, if 'cachedir' is given, in a file there. The
+    returned arrays are shared with the cache, so they are read-only.
+    """
+    filename = None
+    if cachedir is not None:
+        filename = os.path.join(cachedir, "gaussxw_" + str(N) + ".npz")
+
+    if N in gauss_cache:
+        x, w = gauss_cache[N]
+    elif filename is not None and os.path.exists(filename):
+        with np.load(filename) as data:
+            x, w = data["x"], data["w"]
+    else:
+        x, w = legendre_roots(N)
+
+    x.flags.writeable = False
+    w.flags.writeable = False
+    gauss_cache[N] = x, w
+
+    # Write the file even if N was already in memory
+    if filename is not None and not os.path.exists(filename):
+        np.savez(filename, x=x, w=w)
+
+    return x, w
+
+
+def legendre_roots(N):
+    """
+    Return the roots of the Legendre polynomial P_N and the Gauss-Legendre
+    weights at them, computed without any caching.
+    """
+    # Initial approximation to the roots of the Legendre polynomial
+    a = np.linspace(3, 4 * N - 1, N) / (4 * N + 2)
+    x = np.cos(np.pi * a + 1 / (8 * N * N * np.tan(a)))
+
+    # Find the roots using Newton's method
+    delta = 1.0
+    while delta > 1e-15:
+        p0 = np.ones(N, float)
+        p1 = np.copy(x)
+        for k in range(1, N):
+            p0, p1 = p1, ((2 * k + 1) * x * p1 - k * p0) / (k + 1)
+        dp = (N + 1) * (p0 - x * p1) / (1 - x * x)
+        dx = p1 / dp
+        x -= dx
+        delta = np.max(np.abs(dx))
+
+    # Calculate the weights
+    w = 2 * (N + 1) * (N + 1) / (N * N * (1 - x * x) * dp * dp)
+
+    return x, w
+
+
+def integrate_gauss(f, lower, upper, N=20, vectorized=False, cachedir=None):
+    """
+    Integrate the function from lower to upper using N-point
+    Gauss-Legendre quadrature.
+
+    The sample points and weights are computed once for each N and
+    then reused. With 'vectorized' set to 'True', f is called once on
+    the array of all sample points, and lower and upper may be arrays
+    of limits, one integral per entry.
+    """
+    a = lower       # Lower limit of integration
+    b = upper       # Upper limit of integration
+    x, w = gaussxw(N, cachedir)
+
+    # Map the sample points and weights from [-1, 1] to [a, b]
+    if vectorized is True:
+        extra = (1,) * np.ndim(b - a)
+        x = x.reshape((-1,) + extra)
+        w = w.reshape((-1,) + extra)
+        I = np.sum(0.5 * (b - a) * w * f(0.5 * (b - a) * x + 0.5 * (b + a)), axis=0)
+    else:
+        I = 0.0
+        for k in range(N):
+            I += 0.5 * (b - a) * w[k] * f(0.5 * (b - a) * x[k] + 0.5 * (b + a))
+
+    return I, N
+
+
+def kronrod_interval(f, a, b, vectorized=False):
+    """
+    Return the heap entry for the interval [a, b]. The 15-point Kronrod
+    and the embedded 7-point gauss estimates are compared to estimate
+    the error.
+    """
+    h = 0.5 * (b - a)   # Half width
+    c = 0.5 * (b + a)   # Center
+
+    # Sample at the 15 points, negative ones first, then the center
+    x = np.concatenate((c - h * kronrod_x[:-1], c + h * kronrod_x))
+    if vectorized is True:
+        fx = f(x)
+    else:
+        fx = np.array([f(xk) for xk in x])
+    fsum = fx[:7] + fx[7:14]        # f(c - h*x) + f(c + h*x)
+
+    kronrod = h * (np.sum(kronrod_w[:-1] * fsum) + kronrod_w[-1] * fx[14])
+    gauss = h * (np.sum(gauss7_w[:-1] * fsum[1::2]) + gauss7_w[-1] * fx[14])
+    error = abs(kronrod - gauss)
+
+    # heapq pops the smallest entry, so the error is stored negated
+    return -error, a, b, kronrod
+
+
+def integrate_gauss_kronrod(f, lower, upper, accuracy=1e-10, maxeval=100000,
+                            vectorized=False, detailed=False):
+    """
+    Integrate the function from lower to upper using globally adaptive
+    Gauss-Kronrod 7/15 quadrature.
+
+    As in integrate_global_adaptive(), the subinterval with the largest
+    error estimate is split until the total error is below 'accuracy'
+    or another split would exceed 'maxeval' function evaluations.
+
+    Returns the integral, the number of subintervals, the error estimate,
+    and the number of function evaluations.
+    """
+    heap = [kronrod_interval(f, lower, upper, vectorized)]
+    evaluations = 15
+    error = -heap[0][0]
+
+    while error > accuracy and evaluations + 30 <= maxeval:
+
+        # Split the worst subinterval in two
+        worst = heapq.heappop(heap)
+        a, b = worst[1:3]
+        m = 0.5 * (a + b)
+        left = kronrod_interval(f, a, m, vectorized)
+        right = kronrod_interval(f, m, b, vectorized)
+        heapq.heappush(heap, left)
+        heapq.heappush(heap, right)
+        evaluations += 30
+
+        # Update the total error with the change from this split
+        error += worst[0] - left[0] - right[0]
+
+        # Do you want detailed results?
+        if detailed is True:
+            print("N = ", len(heap), ", Error = ", error, sep="")
+
+    I = sum(item[3] for item in heap)
+    error = -sum(item[0] for item in heap)  # Exact sum, free of update roundoff
+
+    return I, len(heap), error, evaluations
+
+
+def tanh_sinh_nodes(lower, upper, t):
+    """
+    Return the sample points x and weights dx/dt of the double exponential
+    change of variables at the values t, together with the distances
+    x - lower and upper - x.
+
+    A finite interval uses the tanh-sinh map, a semi-infinite one the
+    exp-sinh map, and the whole real line the sinh-sinh map. The points
+    crowd toward the endpoints double exponentially but never reach them.
+    The distances are computed directly from t, so they stay accurate
+    where x itself has rounded onto an endpoint.
+    """
+    a = lower
+    b = upper
+    u = 0.5 * np.pi * np.sinh(t)
+    du = 0.5 * np.pi * np.cosh(t)
+
+    if np.isinf(a) and np.isinf(b):
+        x = np.sinh(u)
+        w = np.cosh(u) * du
+        xa, xb = x - a, b - x
+    elif np.isinf(b):
+        x = a + np.exp(u)
+        w = np.exp(u) * du
+        xa, xb = np.exp(u), b - x
+    elif np.isinf(a):
+        x = b - np.exp(u)
+        w = np.exp(u) * du
+        xa, xb = x - a, np.exp(u)
+    else:
+        # Measure from the nearer endpoint so no precision is lost there
+        e = np.exp(-2 * np.abs(u))
+        d = (b - a) * e / (1 + e)
+        x = np.where(u < 0, a + d, b - d)
+        w = 0.5 * (b - a) * du / np.cosh(u)**2
+        xa = np.where(u < 0, d, (b - a) - d)
+        xb = np.where(u < 0, (b - a) - d, d)
+
+    return x, w, xa, xb
+
+
+def tanh_sinh_sum(f, lower, upper, t, vectorized=False, distances=False):
+    """
+    Return the sum of f(x)*dx/dt over the values t, the number of points
+    kept in the sum, and an estimate of the integral lost near the finite
+    endpoints. With 'distances', f is called as f(x, x - lower, upper - x).
+    Points whose term is not
+    finite (the integrand blew up, or the point rounded onto a singular
+    endpoint) are left out. The part of the integral between a finite
+    endpoint and the nearest point kept is estimated as 2|f(x)| times that
+    distance (exact for an inverse square root singularity), but only on a
+    side where points were left out.
+    """
+    with np.errstate(all="ignore"):
+        x, w, xa, xb = tanh_sinh_nodes(lower, upper, t)
+        if distances is True and vectorized is True:
+            fx = f(x, xa, xb)
+        elif distances is True:
+            fx = np.array([f(x[k], xa[k], xb[k]) for k in range(len(x))])
+        elif vectorized is True:
+            fx = f(x)
+        else:
+            fx = np.array([f(xk) for xk in x])
+        terms = w * fx
+
+    kept = np.isfinite(terms)
+    tail = 0.0
+    for end, side in [(lower, t < 0), (upper, t > 0)]:
+        if np.isfinite(end) and np.any(side & ~kept) and np.any(side & kept):
+            d = np.abs(end - x[side & kept])
+            k = np.argmin(d)
+            tail += 2 * np.abs(fx[side & kept][k]) * d[k]
+
+    return np.sum(terms[kept]), int(np.count_nonzero(kept)), tail
+
+
+def integrate_tanh_sinh(f, lower, upper, accuracy=1e-12, detailed=False,
+                        vectorized=False, maxlevel=10, distances=False):
+    """
+    Integrate the function from lower to upper using double exponential
+    (tanh-sinh) quadrature. Either limit may be infinite.
+
+    f is never evaluated at a finite endpoint, so integrable endpoint
+    singularities need no epsilon. Points closer to a nonzero endpoint than
+    its rounding error do land on it, though. Send 'distances' with a value
+    of 'True' to call f as f(x, x - lower, upper - x), with both distances
+    computed exactly, and write the singular factor in terms of them, e.g.
+    f = lambda x, xa, xb: 1/np.sqrt(xb) for 1/sqrt(upper - x). Otherwise
+    the points that land on a singular endpoint are left out, and the
+    missing part is estimated and added to the error.
+
+    The step in t is halved each level and only the new points are
+    evaluated, until two levels agree to within 'accuracy' or 'maxlevel'
+    halvings have been done. A warning is printed if the error estimate is
+    still above 'accuracy' at the end.
+
+    Returns the integral, the number of sample points used in it, the error
+    estimate, and the number of function evaluations.
+    """
+    tmax = 4.0      # Beyond this the weights underflow or the points overflow
+    h = 1.0         # Step in t
+
+    t = np.arange(-tmax, tmax + 0.5 * h, h)
+    s, N, tail = tanh_sinh_sum(f, lower, upper, t, vectorized, distances)
+    evaluations = len(t)
+    I0 = h * s
+    I = I0
+    error = abs(I0)
+
+    # Do you want detailed results?
+    if detailed is True:
+        print("N = ", evaluations, ", I = ", I0, sep="")
+
+    level = 0
+    while error > accuracy and level < maxlevel:
+
+        h *= 0.5
+        t = np.arange(-tmax + h, tmax, 2 * h)     # Only the new points
+        snew, Nnew, tail = tanh_sinh_sum(f, lower, upper, t, vectorized, distances)
+        s += snew
+        N += Nnew
+        evaluations += len(t)
+        level += 1
+
+        I = h * s
+        error = abs(I - I0) + tail     # The newest points lie nearest the endpoints
+        I0 = I
+
+        # Do you want detailed results?
+        if detailed is True:
+            print("N = ", evaluations, ", I = ", I, ", Error = ", error, sep="")
+
+    if error > accuracy:
+        print("WARNING: integrate_tanh_sinh() did not reach the accuracy, error = ", error, sep="")
+
+    return I, N, error, evaluations
+
+
+def integrate_monte_carlo(f, lower, upper, N=100, sampler="random"):
     """
     Integrate a 1D function f from x = lower to x = upper using the
     Monte Carlo mean value method with N random points.
@@ -172,16 +835,21 @@ def integrate_monte_carlo(f, lower, upper, N=100):
     b = upper  # Upper limit of integration
 
     s = 0
-    for i in range(1, N):
-        x = a + (b - a) * rnd.random()
-        s += f(x)
+    if sampler != "random":
+        u = qmc_points(0, N, 1, sampler, qmc_shift(1, sampler))[:, 0]
+        for i in range(N):
+            s += f(a + (b - a) * u[i])
+    else:
+        for i in range(1, N):
+            x = a + (b - a) * rnd.random()
+            s += f(x)
 
     I = (b-a)*s/N
 
     return I
 
 
-def integrate_monte_carlo_nd(f, dim, limit, N=1000000):
+def integrate_monte_carlo_nd(f, dim, limit, N=1000000, sampler="random"):
     """
     Integrate an n-dimensional function using the Monte Carlo mean-value
     method. Takes in the parameters: integrand, dimensions, limits of
@@ -191,6 +859,13 @@ def integrate_monte_carlo_nd(f, dim, limit, N=1000000):
     for n in range(dim):
         I *= (limit[n][1] - limit[n][0])
 
+    if sampler != "random":
+        u = qmc_points(0, N, dim, sampler, qmc_shift(dim, sampler))
+        for k in range(N):
+            x = [limit[n][0] + (limit[n][1] - limit[n][0])*u[k, n] for n in range(dim)]
+            sum += f(x)
+        return I*sum
+
     for k in range(N):
         x = []
         for n in range(dim):
@@ -200,6 +875,613 @@ def integrate_monte_carlo_nd(f, dim, limit, N=1000000):
     return I*sum
 
 
+# Primitive polynomials (degree s, coefficients a) and initial direction
+# numbers m for Sobol dimensions 2 to 16, from Joe and Kuo (2008).
+sobol_table = [(1, 0, [1]),
+               (2, 1, [1, 3]),
+               (3, 1, [1, 3, 1]),
+               (3, 2, [1, 1, 1]),
+               (4, 1, [1, 1, 3, 3]),
+               (4, 4, [1, 3, 5, 13]),
+               (5, 2, [1, 1, 5, 5, 17]),
+               (5, 4, [1, 1, 5, 5, 5]),
+               (5, 7, [1, 1, 7, 11, 19]),
+               (5, 11, [1, 1, 5, 1, 1]),
+               (5, 13, [1, 1, 1, 3, 11]),
+               (5, 14, [1, 3, 5, 5, 31]),
+               (6, 1, [1, 3, 3, 9, 7, 49]),
+               (6, 13, [1, 1, 1, 15, 21, 21]),
+               (6, 16, [1, 3, 1, 13, 27, 49])]
+
+sobol_bits = 30     # Bits per coordinate, so at most 2**30 points
+
+# The first primes, used as the Halton bases
+halton_primes = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53]
+
+
+def sobol_directions(dim):
+    """
+    Return the Sobol direction numbers as an integer array of shape
+    (dim, sobol_bits).
+    """
+    L = sobol_bits
+    V = np.zeros((dim, L), dtype=np.int64)
+    V[0] = [1 << (L - 1 - j) for j in range(L)]     # Van der Corput in base 2
+
+    for d in range(1, dim):
+        s, a, m = sobol_table[d - 1]
+        for j in range(L):
+            if j < s:
+                V[d, j] = m[j] << (L - 1 - j)
+            else:
+                V[d, j] = V[d, j - s] ^ (V[d, j - s] >> s)
+                for k in range(1, s):
+                    if (a >> (s - 1 - k)) & 1:
+                        V[d, j] ^= V[d, j - k]
+
+    return V
+
+
+def qmc_points(start, n, dim, sampler, shift):
+    """
+    Return the points start, ..., start + n - 1 of a randomized Sobol or
+    Halton sequence as an array of shape (n, dim) in the unit cube.
+
+    The Sobol points are scrambled by XOR with the integers in 'shift' (a
+    random digital shift), the Halton points are shifted by the fractions
+    in 'shift' modulo 1 (a Cranley-Patterson rotation).
+    """
+    if dim > len(halton_primes):
+        raise ValueError("Quasi-Monte Carlo is limited to " + str(len(halton_primes)) + " dimensions.")
+
+    i = np.arange(start, start + n, dtype=np.int64)
+    x = np.zeros((n, dim))
+
+    if sampler == "sobol":
+        V = sobol_directions(dim)
+        X = np.zeros((n, dim), dtype=np.int64)
+        for j in range(sobol_bits):
+            X ^= ((i >> j) & 1)[:, None] * V[:, j]
+        x = (X ^ shift) / 2.0**sobol_bits
+
+    elif sampler == "halton":
+        for d in range(dim):
+            p = halton_primes[d]
+            k = np.copy(i)
+            scale = 1 / p
+            while np.any(k > 0):
+                x[:, d] += (k % p) * scale      # Radical inverse of i in base p
+                k //= p
+                scale /= p
+        x = (x + shift) % 1.0
+
+    else:
+        raise ValueError('Unknown sampler "' + str(sampler) + '", use "random", "sobol" or "halton".')
+
+    return x
+
+
+def qmc_shift(dim, sampler):
+    """
+    Draw a random shift for qmc_points().
+    """
+    if sampler == "sobol":
+        return rnd.randint(0, 2**sobol_bits, size=dim).astype(np.int64)
+
+    return rnd.random(dim)
+
+
+def merge_stats(n1, mean1, M2_1, n2, mean2, M2_2):
+    """
+    Merge the sample counts, means and sums of squared deviations of two
+    sets of samples into those of the combined set (Chan et al.).
+    """
+    n = n1 + n2
+    delta = mean2 - mean1
+    mean = mean1 + delta * n2 / n
+    M2 = M2_1 + M2_2 + delta**2 * n1 * n2 / n
+
+    return n, mean, M2
+
+
+def integrate_monte_carlo_vectorized(f, dim, limit, N=1000000, chunk=100000,
+                                     sampler="random", replicates=16):
+    """
+    Integrate an n-dimensional function using the Monte Carlo mean-value
+    method, drawing the random points in blocks of at most 'chunk' points.
+
+    f is called once per block with an array x of shape (dim, n), so that
+    x[0], x[1], ... are arrays of the coordinates as in the other methods,
+    and must return an array of n values.
+
+    For the "sobol" and "halton" samplers the N points are split into
+    'replicates' independently randomized sequences, and the spread of
+    their estimates gives the standard error.
+
+    Returns the integral and its standard error.
+    """
+    a = np.array([limit[n][0] for n in range(dim)], dtype=float)
+    b = np.array([limit[n][1] for n in range(dim)], dtype=float)
+    V = np.prod(b - a)      # Volume of the integration region
+
+    if sampler != "random":
+        M = N // replicates     # Points per randomized sequence
+        estimates = np.zeros(replicates)
+        for r in range(replicates):
+            shift = qmc_shift(dim, sampler)
+            for start in range(0, M, chunk):
+                n = min(chunk, M - start)
+                x = a + (b - a) * qmc_points(start, n, dim, sampler, shift)
+                estimates[r] += np.sum(f(x.T))
+        estimates *= V / M
+
+        return np.mean(estimates), np.std(estimates, ddof=1) / np.sqrt(replicates)
+
+    count, mean, M2 = 0, 0.0, 0.0
+    while count < N:
+        n = min(chunk, N - count)
+        x = a + (b - a) * rnd.random((n, dim))
+        fx = np.asarray(f(x.T), dtype=float)
+
+        count, mean, M2 = merge_stats(count, mean, M2,
+                                      n, np.mean(fx), np.sum((fx - np.mean(fx))**2))
+
+    I = V * mean
+    error = V * np.sqrt(M2 / (N - 1) / N)
+
+    return I, error
+
+
+def integrate_importance(f, p, sample, N=100000):
+    """
+    Integrate the function over the support of the density p using
+    importance sampling.
+
+    'p' is a normalized probability density and 'sample(n)' returns an
+    array of n points drawn from it. The integral is the mean of f/p, which
+    has a small variance when p has roughly the shape of f. Both f and p
+    must accept and return arrays.
+
+    Returns the integral, its standard error, and the variance per
+    sample, so that about variance/error**2 points reach a target error.
+    """
+    x = sample(N)
+    fx = f(x) / p(x)
+
+    variance = np.var(fx, ddof=1)
+    I = np.mean(fx)
+    error = np.sqrt(variance / N)
+
+    return I, error, variance
+
+
+def integrate_stratified(f, dim, limit, N=100000, strata=10):
+    """
+    Integrate an n-dimensional function using stratified Monte Carlo
+    sampling.
+
+    Every dimension is cut into 'strata' equal pieces, giving strata**dim
+    cells, and the same number of random points is drawn in every cell.
+    Only the variance within the cells contributes to the error. f is
+    called as in integrate_monte_carlo_vectorized().
+
+    Returns the integral, its standard error, and the variance per sample.
+    """
+    a = np.array([limit[n][0] for n in range(dim)], dtype=float)
+    b = np.array([limit[n][1] for n in range(dim)], dtype=float)
+    V = np.prod(b - a)      # Volume of the integration region
+
+    cells = strata**dim
+    n = N // cells          # Points per cell
+    if n < 2:
+        raise ValueError("Need at least two points per cell, increase N or reduce strata.")
+
+    # Corner of every cell, in units of the cell width
+    corners = np.indices((strata,) * dim).reshape(dim, -1).T
+
+    I, var = 0.0, 0.0
+    for c in corners:
+        x = a + (b - a) * (c + rnd.random((n, dim))) / strata
+        fx = np.asarray(f(x.T), dtype=float)
+        I += np.mean(fx)
+        var += np.var(fx, ddof=1) / n
+
+    I *= V / cells
+    error = np.sqrt(var) * V / cells
+
+    return I, error, N * error**2
+
+
+def miser_region(f, a, b, N, minpoints, explore):
+    """
+    Recursive stratified sampling of the box [a, b] with N points for
+    integrate_miser(). Returns the integral and its variance.
+    """
+    dim = len(a)
+    V = np.prod(b - a)
+
+    # Small regions are sampled directly
+    if N < 32 * minpoints or dim == 0:
+        x = a + (b - a) * rnd.random((max(N, 2), dim))
+        fx = np.asarray(f(x.T), dtype=float)
+        return V * np.mean(fx), V**2 * np.var(fx, ddof=1) / len(fx)
+
+    # Explore the region to find the best dimension to bisect
+    n = max(int(explore * N), minpoints)
+    x = a + (b - a) * rnd.random((n, dim))
+    fx = np.asarray(f(x.T), dtype=float)
+
+    best, sigmas = 0, None
+    for d in range(dim):
+        left = x[:, d] < 0.5 * (a[d] + b[d])
+        if np.sum(left) < 2 or np.sum(~left) < 2:
+            continue
+        s = np.std(fx[left]), np.std(fx[~left])
+        if sigmas is None or s[0] + s[1] < sigmas[0] + sigmas[1]:
+            best, sigmas = d, s
+
+    if sigmas is None:
+        sigmas = 1.0, 1.0
+
+    # Give each half points in proportion to its standard deviation
+    N -= n
+    if sigmas[0] + sigmas[1] > 0:
+        Nl = int(N * sigmas[0] / (sigmas[0] + sigmas[1]))
+    else:
+        Nl = N // 2
+    Nl = min(max(Nl, minpoints), N - minpoints)
+
+    m = 0.5 * (a[best] + b[best])
+    bl, ar = np.copy(b), np.copy(a)
+    bl[best], ar[best] = m, m
+    Il, varl = miser_region(f, a, bl, Nl, minpoints, explore)
+    Ir, varr = miser_region(f, ar, b, N - Nl, minpoints, explore)
+
+    return Il + Ir, varl + varr
+
+
+def integrate_miser(f, dim, limit, N=100000, minpoints=None, explore=0.1):
+    """
+    Integrate an n-dimensional function using recursive stratified
+    sampling (the MISER algorithm).
+
+    A fraction 'explore' of the points is used to choose the dimension
+    along which bisecting the region reduces the variance the most. The
+    remaining points are split between the halves in proportion to their
+    standard deviations, and each half is treated the same way until it
+    has fewer than 32*minpoints points (minpoints defaults to 16*dim, as
+    in the GSL implementation). f is called as in
+    integrate_monte_carlo_vectorized().
+
+    Returns the integral, its standard error, and the variance per sample.
+    """
+    a = np.array([limit[n][0] for n in range(dim)], dtype=float)
+    b = np.array([limit[n][1] for n in range(dim)], dtype=float)
+
+    if minpoints is None:
+        minpoints = 16 * max(dim, 1)
+
+    I, var = miser_region(f, a, b, N, minpoints, explore)
+
+    return I, np.sqrt(var), N * var
+
+
+def integrate_vegas(f, dim, limit, N=10000, iterations=10, bins=50, alpha=1.5,
+                    detailed=False):
+    """
+    Integrate an n-dimensional function using the VEGAS adaptive
+    importance sampling algorithm.
+
+    Each dimension has a grid of 'bins' intervals, and the points are spread
+    evenly over the intervals, so narrow intervals are sampled densely.
+    After each of the 'iterations' passes of N points, the intervals are
+    moved so that each holds an equal share of the sum of (f*jacobian)**2,
+    with 'alpha' damping the change. The passes are combined weighted by
+    their inverse variances. f is called as in
+    integrate_monte_carlo_vectorized().
+
+    Returns the integral, its standard error, and the variance per sample.
+    """
+    a = np.array([limit[n][0] for n in range(dim)], dtype=float)
+    b = np.array([limit[n][1] for n in range(dim)], dtype=float)
+
+    # Grid edges for every dimension, starting uniform
+    grid = a[:, None] + (b - a)[:, None] * np.linspace(0, 1, bins + 1)
+
+    wsum, Isum = 0.0, 0.0
+    for it in range(iterations):
+
+        y = rnd.random((N, dim)) * bins
+        k = y.astype(int)                   # Interval of each coordinate
+        x = np.zeros((N, dim))
+        jacobian = np.ones(N)
+        for d in range(dim):
+            width = grid[d, k[:, d] + 1] - grid[d, k[:, d]]
+            x[:, d] = grid[d, k[:, d]] + (y[:, d] - k[:, d]) * width
+            jacobian *= bins * width
+
+        fx = np.asarray(f(x.T), dtype=float) * jacobian
+        I = np.mean(fx)
+        var = np.var(fx, ddof=1) / N
+
+        # Combine with the earlier passes
+        if var > 0:
+            wsum += 1 / var
+            Isum += I / var
+        else:
+            wsum, Isum = float("inf"), I
+
+        # Do you want detailed results?
+        if detailed is True:
+            print("Iteration ", it + 1, ", I = ", I, ", Error = ", np.sqrt(var), sep="")
+
+        # Refine the grid of every dimension
+        for d in range(dim):
+            r = np.bincount(k[:, d], weights=fx**2, minlength=bins)
+            r = np.convolve(r, [1, 1, 1], "same") / np.convolve(np.ones(bins), [1, 1, 1], "same")
+            if np.sum(r) == 0:
+                continue
+            r /= np.sum(r)
+            with np.errstate(all="ignore"):
+                r = np.where((r > 0) & (r < 1), ((r - 1) / np.log(r))**alpha, r)
+            edges = np.concatenate(([0], np.cumsum(r)))
+            targets = np.linspace(0, edges[-1], bins + 1)
+            grid[d] = np.interp(targets, edges, grid[d])
+
+    if np.isinf(wsum):
+        return Isum, 0.0, 0.0
+
+    I = Isum / wsum
+    error = np.sqrt(1 / wsum)
+
+    return I, error, iterations * N * error**2
+
+
+def monte_carlo_stream(f, dim, limit, accuracy=1e-3, batch=10000, maxtime=None,
+                       maxpoints=None):
+    """
+    Generate running Monte Carlo estimates of an n-dimensional integral.
+
+    Points are drawn in batches of 'batch' and the running mean and
+    variance are updated after each batch, so memory use does not grow.
+    After every batch (I, error, N) is yielded, with the integral, its
+    standard error and the number of points so far. The generator stops
+    when the error is below 'accuracy', when 'maxtime' seconds have passed,
+    or when 'maxpoints' points have been used. f is called as in
+    integrate_monte_carlo_vectorized().
+    """
+    a = np.array([limit[n][0] for n in range(dim)], dtype=float)
+    b = np.array([limit[n][1] for n in range(dim)], dtype=float)
+    V = np.prod(b - a)      # Volume of the integration region
+
+    start = time.time()
+    count, mean, M2 = 0, 0.0, 0.0
+    while True:
+        x = a + (b - a) * rnd.random((batch, dim))
+        fx = np.asarray(f(x.T), dtype=float)
+
+        count, mean, M2 = merge_stats(count, mean, M2,
+                                      batch, np.mean(fx), np.sum((fx - np.mean(fx))**2))
+
+        I = V * mean
+        error = V * np.sqrt(M2 / (count - 1) / count)
+        yield I, error, count
+
+        if error < accuracy:
+            break
+        if maxtime is not None and time.time() - start > maxtime:
+            break
+        if maxpoints is not None and count + batch > maxpoints:
+            break
+
+
+def integrate_monte_carlo_converge(f, dim, limit, accuracy=1e-3, batch=10000,
+                                   maxtime=None, maxpoints=None, detailed=False):
+    """
+    Integrate an n-dimensional function using the Monte Carlo mean-value
+    method until the standard error is below 'accuracy' or the time or
+    point budget runs out. See monte_carlo_stream().
+
+    Send the 'detailed' parameter with a value of 'True' if you
+    want to print the estimate after every batch.
+
+    Returns the integral, its standard error, and the number of points.
+    """
+    for I, error, N in monte_carlo_stream(f, dim, limit, accuracy, batch, maxtime, maxpoints):
+
+        # Do you want detailed results?
+        if detailed is True:
+            print("N = ", N, ", I = ", I, ", Error = ", error, sep="")
+
+    return I, error, N
+
+
+def hypersphere_volumes(dmax, N=1000000, chunk=100000):
+    """
+    Compute the volumes of the unit hyperspheres in 0, 1, ..., dmax
+    dimensions using the Monte Carlo mean-value method.
+
+    One set of N points in the cube [-1, 1]**dmax is drawn, in blocks of
+    at most 'chunk' points. The running sums of the squared coordinates
+    give the squared radius of every point in every lower dimension, so
+    all the volumes come from the same single pass.
+
+    Returns arrays of the volumes and their standard errors.
+    """
+    inside = np.zeros(dmax + 1)
+    inside[0] = N           # Every point is inside the 0-dimensional sphere
+
+    count = 0
+    while count < N:
+        n = min(chunk, N - count)
+        x = 2 * rnd.random((n, dmax)) - 1
+        r2 = np.cumsum(x**2, axis=1)    # r2[:, d-1] is the radius squared in d dimensions
+        inside[1:] += np.sum(r2 <= 1, axis=0)
+        count += n
+
+    p = inside / N          # Fraction of the cube inside the sphere
+    V = 2.0**np.arange(dmax + 1)
+    error = V * np.sqrt(p * (1 - p) / (N - 1))
+
+    return V * p, error
+
+
+def monte_carlo_block(args):
+    """
+    Sample one block of points for integrate_monte_carlo_parallel().
+    Takes a tuple (f, a, b, n, seed) and returns the sample count, mean
+    and sum of squared deviations of f over n points drawn from the
+    stream given by 'seed'.
+    """
+    f, a, b, n, seed = args
+    rng = np.random.default_rng(seed)
+    x = a + (b - a) * rng.random((n, len(a)))
+    fx = np.asarray(f(x.T), dtype=float)
+
+    return n, np.mean(fx), np.sum((fx - np.mean(fx))**2)
+
+
+def integrate_monte_carlo_parallel(f, dim, limit, N=1000000, seed=None,
+                                   workers=None, chunk=100000):
+    """
+    Integrate an n-dimensional function using the Monte Carlo mean-value
+    method, spread over a pool of 'workers' processes (all cores by default).
+
+    The N points are split into blocks of 'chunk' points and every block
+    draws from its own stream spawned from SeedSequence(seed). The blocks
+    are merged in order, so for a given seed the result does not depend
+    on the number of workers. f is called as in
+    integrate_monte_carlo_vectorized() and must be a module-level function
+    so it can be sent to the worker processes.
+
+    Returns the integral and its standard error.
+    """
+    a = np.array([limit[n][0] for n in range(dim)], dtype=float)
+    b = np.array([limit[n][1] for n in range(dim)], dtype=float)
+    V = np.prod(b - a)      # Volume of the integration region
+
+    sizes = [chunk] * (N // chunk)
+    if N % chunk != 0:
+        sizes.append(N % chunk)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(f, a, b, n, ss) for n, ss in zip(sizes, seeds)]
+
+    if workers == 1:
+        blocks = [monte_carlo_block(task) for task in tasks]
+    else:
+        pool = multiprocessing.Pool(workers)
+        try:
+            blocks = pool.map(monte_carlo_block, tasks)
+        finally:
+            pool.close()
+            pool.join()
+
+    count, mean, M2 = 0, 0.0, 0.0
+    for block in blocks:
+        count, mean, M2 = merge_stats(count, mean, M2, *block)
+
+    I = V * mean
+    error = V * np.sqrt(M2 / (N - 1) / N)
+
+    return I, error
+
+
+def load_data(filename):
+    """
+    Load sampled data from a file. A .npy file is memory-mapped, so it is
+    read from disk a chunk at a time by the data methods instead of being
+    loaded into memory. Any other file is read as whitespace-separated
+    text columns, like sunspots.txt. Returns the columns.
+    """
+    if filename.endswith(".npy"):
+        return np.load(filename, mmap_mode="r").T
+
+    return np.loadtxt(filename, unpack=True)
+
+
+def data_chunk(y, x, dx, start, stop):
+    """
+    Return the samples start to stop (inclusive) as arrays, along with
+    the widths of the intervals between them.
+    """
+    yy = np.asarray(y[start:stop + 1], dtype=float)
+    if x is None:
+        h = np.full(len(yy) - 1, float(dx))
+    else:
+        h = np.diff(np.asarray(x[start:stop + 1], dtype=float))
+
+    return yy, h
+
+
+def integrate_trapz_data(y, x=None, dx=1.0, chunk=1000000):
+    """
+    Integrate sampled data using the trapezoidal rule. The sample points
+    need not be evenly spaced. The data is read 'chunk' samples at a time.
+    """
+    n = len(y)
+    I = 0.0
+    for start in range(0, n - 1, chunk):
+        stop = min(start + chunk, n - 1)
+        yy, h = data_chunk(y, x, dx, start, stop)
+        I += 0.5 * np.sum(h * (yy[:-1] + yy[1:]))
+
+    return I
+
+
+def integrate_simpson_data(y, x=None, dx=1.0, chunk=1000000):
+    """
+    Integrate sampled data using simpson's rule. The sample points need
+    not be evenly spaced. For an odd number of intervals, the last interval
+    is integrated with the quadratic through the last three points. The
+    data is read 'chunk' samples at a time.
+    """
+    n = len(y)
+    m = n - 1               # Number of intervals
+    if m < 2:
+        return integrate_trapz_data(y, x, dx)
+
+    even = m - m % 2        # Intervals covered by pairs
+    step = max(chunk - chunk % 2, 2)
+
+    I = 0.0
+    for start in range(0, even, step):
+        stop = min(start + step, even)
+        yy, h = data_chunk(y, x, dx, start, stop)
+        h0, h1 = h[0::2], h[1::2]
+        I += np.sum((h0 + h1) / 6 * ((2 - h1 / h0) * yy[0:-1:2]
+                                     + (h0 + h1)**2 / (h0 * h1) * yy[1::2]
+                                     + (2 - h0 / h1) * yy[2::2]))
+
+    if m % 2 != 0:
+        yy, h = data_chunk(y, x, dx, m - 2, m)
+        h0, h1 = h
+        I += ((2 * h1**2 + 3 * h0 * h1) / (6 * (h0 + h1)) * yy[2]
+              + (h1**2 + 3 * h0 * h1) / (6 * h0) * yy[1]
+              - h1**3 / (6 * h0 * (h0 + h1)) * yy[0])
+
+    return I
+
+
+def cumulative_trapz_data(y, x=None, dx=1.0, initial=0.0, out=None, chunk=1000000):
+    """
+    Return the running trapezoidal integral of sampled data at every
+    sample point, starting from 'initial'. The result can be written into
+    'out', for example a memory-mapped array for data larger than memory.
+    The data is read 'chunk' samples at a time.
+    """
+    n = len(y)
+    if out is None:
+        out = np.empty(n)
+
+    out[0] = initial
+    for start in range(0, n - 1, chunk):
+        stop = min(start + chunk, n - 1)
+        yy, h = data_chunk(y, x, dx, start, stop)
+        out[start + 1:stop + 1] = out[start] + np.cumsum(0.5 * h * (yy[:-1] + yy[1:]))
+
+    return out
+
+
 def f(x):
     """
     Define
@@ -221,6 +1503,14 @@ def g(x):
     return gx
 
 
+def h(x):
+    """
+    The function g above for arrays of points, to test the vectorized
+    Monte Carlo methods.
+    """
+    return x[0]**2 + x[1]**2 + x[2]**2 <= 1
+
+
 def test_functions():
     """
     This function tests the various numerical integration functions in this module.
@@ -242,6 +1532,52 @@ def test_functions():
         print("WARNING: integrate_simpson() failed the test.")
         isGood = False
 
+    # Test the vectorized trapezoidal and simpson integration functions
+    trapz = integrate_trapz(f, 0, 1, N=1000, vectorized=True, chunk=64)[0]
+    if abs(trapz - 1/3) > 0.00001:
+        print("WARNING: integrate_trapz() failed the vectorized test.")
+        isGood = False
+
+    simps = integrate_simpson(f, 0, 1, N=1000, vectorized=True, chunk=64)[0]
+    if abs(simps - 1 / 3) > 1e-12:
+        print("WARNING: integrate_simpson() failed the vectorized test.")
+        isGood = False
+
+    # Test the batched integration function
+    limits = [[0, 1], [0, 2], [1, 3]]
+    batch = integrate_batch(f, limits, N=1000)[0]
+    if np.max(np.abs(batch - np.array([1/3, 8/3, 26/3]))) > 1e-12:
+        print("WARNING: integrate_batch() failed the test.")
+        isGood = False
+
+    # Test the quadrature plans on x^2 and x^3 at once
+    for rule in ["trapz", "simpson", "gauss"]:
+        plan = QuadraturePlan(rule, 0, 1, 1000)
+        plans = plan([f, lambda x: x**3])
+        if np.max(np.abs(plans - np.array([1/3, 1/4]))) > 1e-6:
+            print("WARNING: QuadraturePlan(\"", rule, "\") failed the test.", sep="")
+            isGood = False
+
+    # Test the data methods on x^2 sampled at uneven points, with small chunks
+    xs = np.sort(np.concatenate(([0, 1], rnd.random(998))))
+    trapz = integrate_trapz_data(f(xs), xs, chunk=100)
+    simps = integrate_simpson_data(f(xs), xs, chunk=100)
+    cumul = cumulative_trapz_data(f(xs), xs, chunk=100)
+    if abs(trapz - 1/3) > 1e-4 or abs(cumul[-1] - trapz) > 1e-12:
+        print("WARNING: integrate_trapz_data() failed the test.")
+        isGood = False
+    if abs(simps - 1/3) > 1e-12:
+        print("WARNING: integrate_simpson_data() failed the test.")
+        isGood = False
+
+    # Test the cumulative integral table against x^3/3 at points off the grid
+    points = []
+    F = Antiderivative(lambda x: points.append(np.size(x)) or f(x), 0, 2, 100)
+    xs = np.array([0.0, 0.123, 1.5, 2.0])
+    if np.max(np.abs(F(xs) - xs**3 / 3)) > 1e-12 or sum(points) != 201:
+        print("WARNING: Antiderivative() failed the test.")
+        isGood = False
+
     # Test the adaptive trapezoidal integration function
     trapz = integrate_trapz_adaptive(f, 0, 1, 1e-12)[0]
     if abs(trapz - 1 / 3) > 1e-12:
@@ -254,6 +1590,67 @@ def test_functions():
         print("WARNING: integrate_simpson_adaptive() failed the test.")
         isGood = False
 
+    # Test that the adaptive methods never evaluate a node twice
+    N, evaluations = integrate_simpson_adaptive(f, 0, 1, 1e-12)[1::2]
+    if evaluations != N + 1:
+        print("WARNING: integrate_simpson_adaptive() re-evaluated nodes.")
+        isGood = False
+
+    # Test the Romberg integration function
+    romb = integrate_romberg(f, 0, 1, 1e-12)[0]
+    if abs(romb - 1 / 3) > 1e-12:
+        print("WARNING: integrate_romberg() failed the test.")
+        isGood = False
+
+    # Test the globally adaptive integration function
+    glob = integrate_global_adaptive(f, 0, 1, 1e-12)[0]
+    if abs(glob - 1 / 3) > 1e-12:
+        print("WARNING: integrate_global_adaptive() failed the test.")
+        isGood = False
+
+    # Test the gaussian quadrature functions
+    gauss = integrate_gauss(f, 0, 1, N=5)[0]
+    if abs(gauss - 1 / 3) > 1e-14:
+        print("WARNING: integrate_gauss() failed the test.")
+        isGood = False
+
+    # N = 5 is in memory now, but must still be written to a cache directory
+    cachedir = tempfile.mkdtemp()
+    x, w = gaussxw(5, cachedir)
+    if x.flags.writeable or not os.path.exists(os.path.join(cachedir, "gaussxw_5.npz")):
+        print("WARNING: gaussxw() failed the cache test.")
+        isGood = False
+    shutil.rmtree(cachedir)
+
+    gauss = integrate_gauss_kronrod(np.exp, 0, 1, 1e-14)[0]
+    if abs(gauss - (np.e - 1)) > 1e-14:
+        print("WARNING: integrate_gauss_kronrod() failed the test.")
+        isGood = False
+
+    # Test the double exponential quadrature function
+    de = integrate_tanh_sinh(lambda x: np.exp(-x**2), -np.inf, np.inf)[0]
+    if abs(de - np.sqrt(np.pi)) > 1e-12:
+        print("WARNING: integrate_tanh_sinh() failed the test.")
+        isGood = False
+
+    de = integrate_tanh_sinh(lambda x: 1 / np.sqrt(x), 0, 1)[0]
+    if abs(de - 2) > 1e-10:
+        print("WARNING: integrate_tanh_sinh() failed the endpoint singularity test.")
+        isGood = False
+
+    # At a nonzero endpoint the points lost to rounding must show in the error
+    de, N, error = integrate_tanh_sinh(lambda x: 1 / np.sqrt(1 - x), 0, 1, 1e-6)[:3]
+    if abs(de - 2) > error or error > 1e-6:
+        print("WARNING: integrate_tanh_sinh() failed the nonzero endpoint test.")
+        isGood = False
+
+    # With the distances the same singularity needs no points left out
+    for fd in [lambda x, xa, xb: 1 / np.sqrt(xb), lambda x, xa, xb: 1 / np.sqrt(xa)]:
+        de, N, error, evaluations = integrate_tanh_sinh(fd, 1, 2, vectorized=True, distances=True)
+        if abs(de - 2) > 1e-12 or N != evaluations:
+            print("WARNING: integrate_tanh_sinh() failed the distances test.")
+            isGood = False
+
     # Test the 1D Monte Carlo integration function
     monte = integrate_monte_carlo(f, 0, 1, 1000000)
     if abs(monte - 1 / 3) > 0.01:
@@ -270,6 +1667,59 @@ def test_functions():
         print("Run the test a few more times.")
         isGood = False
 
+    # Test the vectorized multi-dimensional Monte Carlo integration function
+    monte = integrate_monte_carlo_vectorized(h, 3, [[-1, 1], [-1, 1], [-1, 1]], N=100000)
+    if abs(monte[0] - (4/3)*np.pi) > 5*monte[1]:
+        print("WARNING: integrate_monte_carlo_vectorized() failed the test.")
+        print("NOTE: There is a small probability of random failure with this method.")
+        print("Run the test a few more times.")
+        isGood = False
+
+    # Test the quasi-Monte Carlo samplers
+    for sampler in ["sobol", "halton"]:
+        monte = integrate_monte_carlo_vectorized(h, 3, [[-1, 1], [-1, 1], [-1, 1]],
+                                                 N=2**16, sampler=sampler)
+        if abs(monte[0] - (4/3)*np.pi) > 5*monte[1] or monte[1] > 0.01:
+            print("WARNING: integrate_monte_carlo_vectorized() failed the", sampler, "test.")
+            isGood = False
+
+    # Test the variance reduction methods on a peaked integrand
+    peak = lambda x: np.exp(-100 * np.sum((x - 0.5)**2, axis=0))
+    exact = np.pi / 100
+    for method in [integrate_stratified, integrate_miser, integrate_vegas]:
+        monte = method(peak, 2, [[0, 1], [0, 1]], 100000)
+        if abs(monte[0] - exact) > 5*monte[1]:
+            print("WARNING: ", method.__name__, "() failed the test.", sep="")
+            isGood = False
+
+    monte = integrate_importance(lambda x: np.exp(-x**2),
+                                 lambda x: np.exp(-x**2 / 2) / np.sqrt(2 * np.pi),
+                                 lambda n: rnd.normal(size=n))
+    if abs(monte[0] - np.sqrt(np.pi)) > 5*monte[1]:
+        print("WARNING: integrate_importance() failed the test.")
+        isGood = False
+
+    # Test the hypersphere sweep against V_3 = 4 pi / 3
+    volumes, errors = hypersphere_volumes(3, 100000)
+    if abs(volumes[3] - (4/3)*np.pi) > 5*errors[3] or volumes[1] != 2:
+        print("WARNING: hypersphere_volumes() failed the test.")
+        isGood = False
+
+    # Test the convergence-controlled Monte Carlo function
+    monte = integrate_monte_carlo_converge(h, 3, [[-1, 1], [-1, 1], [-1, 1]], 0.01)
+    if monte[1] >= 0.01 or abs(monte[0] - (4/3)*np.pi) > 5*monte[1]:
+        print("WARNING: integrate_monte_carlo_converge() failed the test.")
+        isGood = False
+
+    # Test that the parallel Monte Carlo result does not depend on the workers
+    one = integrate_monte_carlo_parallel(h, 3, [[-1, 1], [-1, 1], [-1, 1]], 100000,
+                                         seed=1, workers=1, chunk=10000)
+    two = integrate_monte_carlo_parallel(h, 3, [[-1, 1], [-1, 1], [-1, 1]], 100000,
+                                         seed=1, workers=2, chunk=10000)
+    if one != two or abs(one[0] - (4/3)*np.pi) > 5*one[1]:
+        print("WARNING: integrate_monte_carlo_parallel() failed the test.")
+        isGood = False
+
     if isGood is True:
         print("Module is good.")
 
@@ -23,7 +23,7 @@ R = 3.844e8         # [m]
 w = 2.662e-6        # [1/s], omega
 
 #
-# Define the polynomial and its derivative
+# Define the polynomial. Its derivative is computed automatically.
 #
 
 
@@ -34,18 +34,11 @@ def f(r):
     return (w**2)*(r**5) - 2*R*(w**2)*(r**4) + (w*R)**2*(r**3) + (m-M)*G*(r**2) + 2*G*M*R*r - G*M*(R**2)
 
 
-def dfdr(r):
-    """
-    The first derivative of the polynomial.
-    """
-    return 5*(w**2)*(r**4) - 8*R*(w**2)*(r**3) + 3*(w*R*r)**2 + 2*(m-M)*G*r + 2*G*M*R
-
-
 #
 # Find the root using Newton's method. We know the solution is between 0
 # and R, so a reasonable starting guess is r = R/2.
 #
 
-root = mmr.newton(f, dfdr, R/2, 1e-6)[0]
+root = mmr.newton_auto(f, R/2, 1e-6)[0]
 print("\nr = ", root, sep="")
 print("So the L1 Lagrange point is about ", int(root/1000), "km from the center of Earth.", sep="")
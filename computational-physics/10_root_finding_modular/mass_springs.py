@@ -1,9 +1,16 @@
 #! /usr/bin/env python
 """
 Finds the equilibrium angle for a mass on two springs. This
-involves find the root of a nonlinear equation. This root is found using four
+involves find the root of a nonlinear equation. This root is found using six
 different methods--the bisection method, the false position method, Newton's
-method, and the secant method.
+method, the secant method, the Illinois false position method, and Brent's
+method. The last two also report how many times the function was evaluated.
+Finally, Newton's method and Halley's method are run with derivatives
+computed by automatic differentiation.
+
+The same equilibrium is also found as a system of two equations, the net
+force on the mass in x and y, using Newton's method and Broyden's method.
+These report how many times the Jacobian was formed.
 
 Leon Hostetler, Mar. 25, 2017
 
@@ -60,3 +67,46 @@ print("theta = ", newton[0], ", iterations = ", newton[1], sep="")
 secant = mmr.secant(f, 0.1, 1, 1e-14)
 print("\nSecant method:")
 print("theta = ", secant[0], ", iterations = ", secant[1], sep="")
+
+illinois = mmr.fposition_illinois(f, 0.1, 1, 1e-14)
+print("\nIllinois false position method:")
+print("theta = ", illinois[0], ", iterations = ", illinois[1],
+      ", evaluations = ", illinois[2], sep="")
+
+brent = mmr.brent(f, 0, np.pi/2, 1e-14)
+print("\nBrent's method:")
+print("theta = ", brent[0], ", iterations = ", brent[1],
+      ", evaluations = ", brent[2], sep="")
+
+newton_auto = mmr.newton_auto(f, np.pi/4, 1e-14)
+print("\nNewton's method with automatic derivative:")
+print("theta = ", newton_auto[0], ", iterations = ", newton_auto[1], sep="")
+
+halley = mmr.halley(f, np.pi/4, 1e-14)
+print("\nHalley's method with automatic derivatives:")
+print("theta = ", halley[0], ", iterations = ", halley[1], sep="")
+
+
+#
+# The same problem as a force balance in two dimensions. The springs hang
+# from (-L, 0) and (L, 0) with natural length L.
+#
+
+
+def force(r):
+    """
+    The net force on the mass at position r = [x, y]
+    """
+    F = np.array([0.0, -m*g])
+    for anchor in [np.array([-L, 0.0]), np.array([L, 0.0])]:
+        d = r - anchor
+        length = np.sqrt(np.dot(d, d))
+        F -= k*(length - L)*d/length
+    return F
+
+
+for name, method in [("Newton's method", mmr.newton_system), ("Broyden's method", mmr.broyden)]:
+    r, iterations, evaluations, jacobians = method(force, [0.05, -0.2], accuracy=1e-14)
+    print("\n", name, " for the force balance:", sep="")
+    print("theta = ", np.arctan(-r[1]/L), ", x = ", r[0], ", iterations = ", iterations,
+          ", evaluations = ", evaluations, ", jacobians = ", jacobians, sep="")
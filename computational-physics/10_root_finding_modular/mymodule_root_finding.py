@@ -10,6 +10,14 @@ Symbols and parameters:
     'x0' is a user-supplied guess
     'accuracy' is the level of precision you want
     'a' and 'b' are user-supplied guesses
+    'F' for the system methods is a user-defined vector function of a vector
+        x, e.g. F(x) = np.array([x[0]**2 + x[1]**2 - 4, x[0] - x[1]])
+    'jacobian' is a user-defined function returning the matrix dF_i/dx_j,
+        or None to use finite differences
+    'args' for the array methods is a tuple of parameter arrays. Element i
+        of the problem solves f(x, args[0][i], args[1][i], ...) = 0.
+    'cachesize' is the number of f(x) values remembered by Instrumented
+    'maxiter' is the maximum number of iterations for the array methods
 
 Leon Hostetler, Mar. 21, 2017
 
@@ -18,6 +26,9 @@ USAGE: Used as a supplement to a main program.
 
 from __future__ import division, print_function
 import numpy as np
+import collections
+import numbers
+import time
 import sys
 
 
@@ -37,6 +48,200 @@ def newton(f, dfdx, x0, accuracy=1e-10):
     return [x0, i]
 
 
+class Dual:
+    """
+    A number carrying its first and second derivatives (forward-mode
+    automatic differentiation). The parts may be numbers or NumPy arrays.
+    """
+
+    def __init__(self, value, d1=0.0, d2=0.0):
+        self.value = value
+        self.d1 = d1    # First derivative
+        self.d2 = d2    # Second derivative
+
+    def chain(self, g, dg, ddg):
+        """ Apply a function with value g, derivative dg and second derivative ddg at self.value. """
+        return Dual(g, dg*self.d1, ddg*self.d1**2 + dg*self.d2)
+
+    def __add__(self, other):
+        other = lift(other)
+        return Dual(self.value + other.value, self.d1 + other.d1, self.d2 + other.d2)
+
+    def __sub__(self, other):
+        other = lift(other)
+        return Dual(self.value - other.value, self.d1 - other.d1, self.d2 - other.d2)
+
+    def __mul__(self, other):
+        other = lift(other)
+        return Dual(self.value*other.value,
+                    self.d1*other.value + self.value*other.d1,
+                    self.d2*other.value + 2*self.d1*other.d1 + self.value*other.d2)
+
+    def __truediv__(self, other):
+        other = lift(other)
+        q = self.value/other.value
+        q1 = (self.d1 - q*other.d1)/other.value
+        q2 = (self.d2 - 2*q1*other.d1 - q*other.d2)/other.value
+        return Dual(q, q1, q2)
+
+    def __pow__(self, other):
+        if isinstance(other, Dual):
+            return (other*self.log()).exp()
+        n = other
+
+        # The vanishing terms are left out so that x**0 and x**1 work at x = 0
+        if n == 0:
+            return self.chain(self.value**0, 0.0, 0.0)
+        if n == 1:
+            return self.chain(self.value, 1.0, 0.0)
+        return self.chain(self.value**n, n*self.value**(n - 1), n*(n - 1)*self.value**(n - 2))
+
+    def __radd__(self, other):
+        return lift(other) + self
+
+    def __rsub__(self, other):
+        return lift(other) - self
+
+    def __rmul__(self, other):
+        return lift(other)*self
+
+    def __rtruediv__(self, other):
+        return lift(other)/self
+
+    def __rpow__(self, other):
+        return (self*np.log(other)).exp()
+
+    def __neg__(self):
+        return Dual(-self.value, -self.d1, -self.d2)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return self.chain(np.abs(self.value), np.sign(self.value), 0.0)
+
+    __div__ = __truediv__
+    __rdiv__ = __rtruediv__
+
+    def sin(self):
+        return self.chain(np.sin(self.value), np.cos(self.value), -np.sin(self.value))
+
+    def cos(self):
+        return self.chain(np.cos(self.value), -np.sin(self.value), -np.cos(self.value))
+
+    def tan(self):
+        t = np.tan(self.value)
+        return self.chain(t, 1 + t**2, 2*t*(1 + t**2))
+
+    def exp(self):
+        e = np.exp(self.value)
+        return self.chain(e, e, e)
+
+    def log(self):
+        return self.chain(np.log(self.value), 1/self.value, -1/self.value**2)
+
+    def sqrt(self):
+        r = np.sqrt(self.value)
+        return self.chain(r, 0.5/r, -0.25/(r*self.value))
+
+    def arctan(self):
+        return self.chain(np.arctan(self.value), 1/(1 + self.value**2),
+                          -2*self.value/(1 + self.value**2)**2)
+
+    def sinh(self):
+        return self.chain(np.sinh(self.value), np.cosh(self.value), np.sinh(self.value))
+
+    def cosh(self):
+        return self.chain(np.cosh(self.value), np.sinh(self.value), np.cosh(self.value))
+
+    def tanh(self):
+        t = np.tanh(self.value)
+        return self.chain(t, 1 - t**2, -2*t*(1 - t**2))
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        """ Let NumPy functions such as np.sin, and NumPy arrays, work with Dual numbers. """
+        if method != "__call__" or len(kwargs) > 0:
+            return NotImplemented
+
+        binary = {np.add: Dual.__add__, np.subtract: Dual.__sub__,
+                  np.multiply: Dual.__mul__, np.true_divide: Dual.__truediv__,
+                  np.power: Dual.__pow__}
+        unary = {np.negative: Dual.__neg__, np.absolute: Dual.__abs__, np.sin: Dual.sin, np.cos: Dual.cos,
+                 np.tan: Dual.tan, np.exp: Dual.exp, np.log: Dual.log,
+                 np.sqrt: Dual.sqrt, np.arctan: Dual.arctan, np.sinh: Dual.sinh,
+                 np.cosh: Dual.cosh, np.tanh: Dual.tanh}
+
+        if ufunc in binary:
+            if isinstance(inputs[0], Dual):
+                return binary[ufunc](inputs[0], inputs[1])
+            if ufunc is np.power:
+                return Dual.__rpow__(inputs[1], inputs[0])
+            return binary[ufunc](lift(inputs[0]), inputs[1])
+        if ufunc in unary:
+            return unary[ufunc](inputs[0])
+
+        return NotImplemented
+
+
+def lift(x):
+    """
+    Return x as a Dual number, treating a plain number as a constant.
+    """
+    if isinstance(x, Dual):
+        return x
+
+    return Dual(x, 0.0, 0.0)
+
+
+def derivatives(f, x):
+    """
+    Return f(x), f'(x) and f''(x), computed exactly by automatic
+    differentiation. x may be a number or a NumPy array, and f may use
+    arithmetic and the NumPy functions handled by the Dual class.
+    """
+    x = np.asarray(x, dtype=np.result_type(x, float))[()]     # Integers cannot take negative powers
+    fx = lift(f(Dual(x, np.ones_like(x, dtype=float), np.zeros_like(x, dtype=float))))
+
+    return fx.value, fx.d1, fx.d2
+
+
+def newton_auto(f, x0, accuracy=1e-10):
+    """
+    Newton's method for finding a root, with the derivative computed by
+    automatic differentiation, so no dfdx is needed. Requires a function f,
+    a guess value x, and the required precision.
+    """
+    xlast = float("inf")
+
+    i = 0
+    while np.abs(x0 - xlast) > accuracy:
+        xlast = x0
+        fx, dfx = derivatives(f, xlast)[:2]
+        x0 = xlast - fx/dfx
+        i += 1
+
+    return [x0, i]
+
+
+def halley(f, x0, accuracy=1e-10):
+    """
+    Halley's method for finding a root, with the first and second
+    derivatives computed by automatic differentiation. It converges
+    cubically near a simple root. Requires a function f, a guess value x,
+    and the required precision.
+    """
+    xlast = float("inf")
+
+    i = 0
+    while np.abs(x0 - xlast) > accuracy:
+        xlast = x0
+        fx, dfx, ddfx = derivatives(f, xlast)
+        x0 = xlast - 2*fx*dfx/(2*dfx**2 - fx*ddfx)
+        i += 1
+
+    return [x0, i]
+
+
 def secant(f, a, b, accuracy=1e-10):
     """
     Secant method for finding a root. Requires a function f, two
@@ -57,7 +262,8 @@ def bisection(f, a, b, accuracy=1e-10):
     for finding the root of a function.
     """
 
-    if f(a)*f(b) > 0:
+    fa = f(a)   # Kept up to date so f is evaluated once per iteration
+    if fa*f(b) > 0:
         raise ValueError('Your bracketing values do not have opposite sign!')
 
     mid = 0.5 * (a + b)  # Midpoint
@@ -68,8 +274,9 @@ def bisection(f, a, b, accuracy=1e-10):
     i = 0
     while np.abs(a - b) > accuracy:
         mid = 0.5 * (a + b)
-        if f(mid)*f(a) > 0:
-            a = mid
+        fmid = f(mid)
+        if fmid*fa > 0:
+            a, fa = mid, fmid
         else:
             b = mid
         i += 1
@@ -105,6 +312,488 @@ def fposition(f, a, b, accuracy=1e-10):
     return [x, i]
 
 
+def fposition_illinois(f, a, b, accuracy=1e-10, variant="illinois", maxiter=1000):
+    """
+    The false position method with the Illinois or Anderson-Bjorck
+    modification. When the same end of the bracket is kept twice in a
+    row, its function value is scaled down (halved for "illinois", by
+    1 - f(x)/f(b) for "anderson-bjorck"), so that end is eventually
+    replaced too and the method does not stall on one side. The function
+    values at the bracket ends are kept, so each iteration costs a
+    single evaluation.
+
+    Returns the root, the number of iterations, and the number of
+    function evaluations.
+    """
+    fa, fb = f(a), f(b)
+    evaluations = 2
+    if fa*fb > 0:
+        raise ValueError('Your bracketing values do not have opposite sign!')
+
+    x, xl = b, float("inf")
+
+    i = 0
+    while np.abs(x - xl) > accuracy and fb != 0 and i < maxiter:
+        xl = x
+        x = (a*fb - b*fa)/(fb - fa)     # Root of the linear interpolant
+        fx = f(x)
+        evaluations += 1
+        i += 1
+
+        if fx*fb < 0:
+            a, fa = b, fb       # The old b becomes the other end
+        elif variant == "anderson-bjorck" and 1 - fx/fb > 0:
+            fa *= 1 - fx/fb
+        else:
+            fa *= 0.5
+        b, fb = x, fx
+
+    return [x, i, evaluations]
+
+
+def brent(f, a, b, accuracy=1e-10, maxiter=200):
+    """
+    Brent's method for finding the root in the bracket [a, b]. Inverse
+    quadratic interpolation or the secant step is used when it stays well
+    inside the bracket, and bisection otherwise, so it converges as fast
+    as the secant method but never leaves the bracket. Each iteration
+    costs a single evaluation of f.
+
+    Returns the root, the number of iterations, and the number of
+    function evaluations.
+    """
+    fa, fb = f(a), f(b)
+    evaluations = 2
+    if fa*fb > 0:
+        raise ValueError('Your bracketing values do not have opposite sign!')
+
+    c, fc = b, fb
+    d = e = b - a
+
+    for i in range(maxiter):
+        # Keep the root between b and c
+        if (fb > 0 and fc > 0) or (fb < 0 and fc < 0):
+            c, fc = a, fa
+            d = e = b - a
+
+        # Make b the best estimate so far
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+
+        tol = 2*np.finfo(float).eps*abs(b) + 0.5*accuracy
+        xm = 0.5*(c - b)
+        if abs(xm) <= tol or fb == 0:
+            return [b, i, evaluations]
+
+        if abs(e) >= tol and abs(fa) > abs(fb):
+            s = fb/fa
+            if a == c:      # Secant step
+                p = 2*xm*s
+                q = 1 - s
+            else:           # Inverse quadratic interpolation
+                q = fa/fc
+                r = fb/fc
+                p = s*(2*xm*q*(q - r) - (b - a)*(r - 1))
+                q = (q - 1)*(r - 1)*(s - 1)
+            if p > 0:
+                q = -q
+            p = abs(p)
+
+            # Accept the interpolation only if it stays inside the bracket
+            if 2*p < min(3*xm*q - abs(tol*q), abs(e*q)):
+                e, d = d, p/q
+            else:
+                d = e = xm
+        else:
+            d = e = xm      # Bisection step
+
+        a, fa = b, fb
+        if abs(d) > tol:
+            b += d
+        else:
+            b += tol if xm > 0 else -tol
+        fb = f(b)
+        evaluations += 1
+
+    return [b, maxiter, evaluations]
+
+
+def jacobian_fd(F, x, Fx=None, h=1e-7):
+    """
+    Return the Jacobian matrix of F at x by forward differences. Fx is F(x)
+    if it is already known. Costs len(x) evaluations of F (one more if Fx
+    is not given).
+    """
+    x = np.asarray(x, dtype=float)
+    if Fx is None:
+        Fx = np.asarray(F(x), dtype=float)
+
+    J = np.zeros([len(Fx), len(x)])
+    for j in range(len(x)):
+        step = h*max(abs(x[j]), 1.0)
+        xh = np.copy(x)
+        xh[j] += step
+        J[:, j] = (np.asarray(F(xh), dtype=float) - Fx)/step
+
+    return J
+
+
+def line_search(F, x, Fx, dx):
+    """
+    Backtracking line search along the step dx. The step is halved until
+    |F|^2 drops enough (the Armijo condition), at most down to 1e-4 of dx.
+    If it never does, the point with the smallest |F|^2 is used, or x
+    itself if none of them is lower. Returns the new x, F at the new x,
+    the number of evaluations of F, and whether x moved.
+    """
+    f0 = np.dot(Fx, Fx)
+    best = x, Fx, f0
+    t = 1.0
+    evaluations = 0
+    while t >= 1e-4:
+        xn = x + t*dx
+        Fn = np.asarray(F(xn), dtype=float)
+        fn = np.dot(Fn, Fn)
+        evaluations += 1
+        if fn <= (1 - 1e-4*t)*f0:
+            return xn, Fn, evaluations, True
+        if fn < best[2]:
+            best = xn, Fn, fn
+        t *= 0.5
+
+    return best[0], best[1], evaluations, best[2] < f0
+
+
+def newton_system(F, x0, jacobian=None, accuracy=1e-10, maxiter=100):
+    """
+    Newton's method for a system of nonlinear equations F(x) = 0. The
+    Jacobian is supplied by the user or computed by finite differences
+    at every step, and a backtracking line search keeps the steps from
+    overshooting far from the root. The iteration stops when the Newton
+    step is smaller than 'accuracy'. A warning is printed if it stops
+    for any other reason, i.e. after 'maxiter' iterations or when the
+    line search cannot reduce |F|.
+
+    Returns the root, the number of iterations, the number of evaluations
+    of F (including those for finite differences), and the number of
+    Jacobian evaluations.
+    """
+    x = np.array(x0, dtype=float)
+    Fx = np.asarray(F(x), dtype=float)
+    evaluations, jacobians = 1, 0
+    converged = not np.any(Fx != 0)
+
+    i = 0
+    while i < maxiter and not converged:
+        if jacobian is None:
+            J = jacobian_fd(F, x, Fx)
+            evaluations += len(x)
+        else:
+            J = jacobian(x)
+        jacobians += 1
+
+        dx = np.linalg.solve(J, -Fx)
+        xn, Fn, n, moved = line_search(F, x, Fx, dx)
+        evaluations += n
+        i += 1
+
+        converged = np.max(np.abs(dx)) < accuracy or not np.any(Fn != 0)
+        if not moved:
+            break
+        x, Fx = xn, Fn
+
+    if not converged:
+        print("WARNING: newton_system() did not converge, |F| = ", np.sqrt(np.dot(Fx, Fx)), sep="")
+
+    return [x, i, evaluations, jacobians]
+
+
+def broyden(F, x0, jacobian=None, accuracy=1e-10, maxiter=200):
+    """
+    Broyden's quasi-Newton method for a system of nonlinear equations
+    F(x) = 0. The Jacobian is formed once, then corrected after every step
+    with a rank-one update from the change in F, so later steps cost a
+    single evaluation of F. If the line search cannot reduce |F|, the
+    Jacobian is formed afresh. The iteration stops when the step is
+    smaller than 'accuracy'. A warning is printed if it stops for any
+    other reason, i.e. after 'maxiter' iterations or when even a fresh
+    Jacobian gives no step that reduces |F|.
+
+    Returns the root, the number of iterations, the number of evaluations
+    of F (including those for finite differences), and the number of
+    Jacobian evaluations.
+    """
+    x = np.array(x0, dtype=float)
+    Fx = np.asarray(F(x), dtype=float)
+    evaluations, jacobians = 1, 0
+    converged = not np.any(Fx != 0)
+    J = None
+
+    i = 0
+    while i < maxiter and not converged:
+        fresh = J is None
+        if fresh:
+            if jacobian is None:
+                J = jacobian_fd(F, x, Fx)
+                evaluations += len(x)
+            else:
+                J = jacobian(x)
+            jacobians += 1
+
+        dx = np.linalg.solve(J, -Fx)
+        xn, Fn, n, moved = line_search(F, x, Fx, dx)
+        evaluations += n
+        i += 1
+
+        converged = np.max(np.abs(dx)) < accuracy or not np.any(Fn != 0)
+        if not moved:
+            if fresh or converged:
+                break
+            J = None    # The update has gone stale, form the Jacobian again
+            continue
+
+        s = xn - x
+        y = Fn - Fx
+        J = J + np.outer(y - np.dot(J, s), s)/np.dot(s, s)
+        x, Fx = xn, Fn
+
+    if not converged:
+        print("WARNING: broyden() did not converge, |F| = ", np.sqrt(np.dot(Fx, Fx)), sep="")
+
+    return [x, i, evaluations, jacobians]
+
+
+def array_setup(a, b, args):
+    """
+    Broadcast the guesses and parameters of an array method to a common
+    shape and flatten them. Returns a, b, the flattened parameters, and
+    the original shape.
+    """
+    arrays = np.broadcast_arrays(np.asarray(a, dtype=float), np.asarray(b, dtype=float),
+                                 *[np.asarray(p) for p in args])
+    shape = arrays[0].shape
+    a, b = [np.array(arr, dtype=float).ravel() for arr in arrays[:2]]
+    params = [np.ravel(arr) for arr in arrays[2:]]
+
+    return a, b, params, shape
+
+
+def bisection_array(f, a, b, accuracy=1e-10, args=(), maxiter=1000):
+    """
+    The bisection method for many independent brackets at once. a and b
+    are arrays of bracketing values, and f(x, *args) must work elementwise
+    on arrays. Each iteration evaluates f only at the elements that have
+    not yet converged. An element also stops once its bracket cannot be
+    split any further or after 'maxiter' iterations. Returns the array of
+    roots and the array of iteration counts.
+    """
+    a, b, params, shape = array_setup(a, b, args)
+
+    fa = f(a, *params)
+    if np.any(fa * f(b, *params) > 0):
+        raise ValueError('Your bracketing values do not have opposite sign!')
+
+    mid = 0.5 * (a + b)
+    i = np.zeros(len(a), dtype=int)
+    idx = np.flatnonzero(np.abs(a - b) > accuracy)  # Elements still running
+
+    while idx.size > 0:
+        m = 0.5 * (a[idx] + b[idx])
+        fm = f(m, *[p[idx] for p in params])
+        mid[idx] = m
+        i[idx] += 1
+
+        # Brackets between adjacent floats cannot shrink any further
+        split = (m != a[idx]) & (m != b[idx])
+
+        left = fm * fa[idx] > 0
+        a[idx[left]], fa[idx[left]] = m[left], fm[left]
+        b[idx[~left]] = m[~left]
+
+        # Exact roots are finished too
+        a[idx[fm == 0]] = b[idx[fm == 0]] = m[fm == 0]
+
+        idx = idx[(np.abs(a[idx] - b[idx]) > accuracy) & split & (i[idx] < maxiter)]
+
+    return [mid.reshape(shape), i.reshape(shape)]
+
+
+def secant_array(f, a, b, accuracy=1e-10, args=(), maxiter=1000):
+    """
+    The secant method for many independent pairs of guesses at once.
+    f(x, *args) must work elementwise on arrays, and is evaluated only at
+    the elements that have not yet converged. An element also stops if
+    its secant becomes flat or after 'maxiter' iterations. Returns the
+    array of roots and the array of iteration counts.
+    """
+    a, b, params, shape = array_setup(a, b, args)
+
+    fa = f(a, *params)
+    fb = f(b, *params)
+    i = np.zeros(len(a), dtype=int)
+    idx = np.flatnonzero((np.abs(a - b) > accuracy) & (fa != fb))
+
+    while idx.size > 0:
+        x = b[idx] - fb[idx] * (b[idx] - a[idx]) / (fb[idx] - fa[idx])
+        a[idx], fa[idx] = b[idx], fb[idx]
+        b[idx] = x
+        fb[idx] = f(x, *[p[idx] for p in params])
+        i[idx] += 1
+
+        keep = (np.abs(a[idx] - b[idx]) > accuracy) & (fa[idx] != fb[idx]) & (i[idx] < maxiter)
+        idx = idx[keep]
+
+    return [b.reshape(shape), i.reshape(shape)]
+
+
+def fposition_array(f, a, b, accuracy=1e-10, args=(), maxiter=1000, variant=None):
+    """
+    The false position method for many independent brackets at once.
+    f(x, *args) must work elementwise on arrays. The function values at the
+    ends of the brackets are kept, so each iteration costs one evaluation
+    per unconverged element. Set 'variant' to "illinois" or
+    "anderson-bjorck" for the modifications of fposition_illinois().
+    Returns the array of roots and the array of iteration counts.
+    """
+    a, b, params, shape = array_setup(a, b, args)
+
+    fa = f(a, *params)
+    fb = f(b, *params)
+    if np.any(fa * fb > 0):
+        raise ValueError('Your bracketing values do not have opposite sign!')
+
+    x = np.copy(a)
+    i = np.zeros(len(a), dtype=int)
+    last = np.zeros(len(a), dtype=int) - 1  # 1 if a was replaced last, 0 if b, -1 at first
+    idx = np.flatnonzero((fa != 0) & (fb != 0))
+    x[fb == 0] = b[fb == 0]
+
+    while idx.size > 0:
+        xl = x[idx]
+        xn = b[idx] - fb[idx] * (b[idx] - a[idx]) / (fb[idx] - fa[idx])
+        fx = f(xn, *[p[idx] for p in params])
+        x[idx] = xn
+        i[idx] += 1
+
+        left = fx * fa[idx] > 0
+        if variant is not None:
+            # Scale down the value at an end kept twice in a row, as in fposition_illinois()
+            if variant == "anderson-bjorck":
+                m = 1 - fx / np.where(left, fa[idx], fb[idx])
+                m = np.where(m > 0, m, 0.5)
+            else:
+                m = np.full(len(idx), 0.5)
+            again = left == last[idx]
+            fb[idx[left & again]] *= m[left & again]
+            fa[idx[~left & again]] *= m[~left & again]
+            last[idx] = left
+        a[idx[left]], fa[idx[left]] = xn[left], fx[left]
+        b[idx[~left]], fb[idx[~left]] = xn[~left], fx[~left]
+
+        keep = (np.abs(xn - xl) > accuracy) & (fx != 0) & (i[idx] < maxiter)
+        idx = idx[keep]
+
+    return [x.reshape(shape), i.reshape(shape)]
+
+
+class Instrumented:
+    """Wrap a function to memoize, count, time and record its evaluations."""
+
+    def __init__(self, function, cachesize=128):
+        self.func = function
+        self.cachesize = cachesize
+        self.cache = collections.OrderedDict()  # Least recently used first
+        self.calls = 0          # Calls made by the root finder
+        self.evaluations = 0    # Calls passed on to the function
+        self.hits = 0           # Calls answered from the cache
+        self.times = []         # Time taken by each evaluation
+        self.trajectory = []    # Every x the root finder asked for
+
+    def __call__(self, x):
+        self.calls += 1
+        self.trajectory.append(x)
+
+        # Only real numbers are cached, arrays, complex numbers and Dual
+        # numbers are always evaluated
+        key = float(x) if isinstance(x, numbers.Real) else None
+        if key is not None and key in self.cache:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return self.cache[key]
+
+        start = time.time()
+        fx = self.func(x)
+        self.times.append(time.time() - start)
+        self.evaluations += 1
+
+        if key is not None and self.cachesize > 0:
+            self.cache[key] = fx
+            if len(self.cache) > self.cachesize:
+                self.cache.popitem(last=False)
+
+        return fx
+
+
+class RootResult:
+    """The root found by a method together with the cost of finding it."""
+
+    def __init__(self, result, instrumented):
+        self.root = result[0]
+        self.iterations = result[1]
+        self.calls = instrumented.calls
+        self.evaluations = instrumented.evaluations
+        self.hits = instrumented.hits
+        self.times = instrumented.times
+        self.seconds = sum(instrumented.times)
+        self.trajectory = instrumented.trajectory
+
+    def print(self):
+        """ Prints the root and the statistics. """
+        print("root = ", self.root, ", iterations = ", self.iterations, sep="")
+        print("calls = ", self.calls, ", evaluations = ", self.evaluations,
+              ", cache hits = ", self.hits, ", time in f = ", self.seconds, " s", sep="")
+
+
+def instrumented(method, f, *args, **kwargs):
+    """
+    Run a root-finding method, e.g. instrumented(secant, f, a, b, 1e-10),
+    with f wrapped in Instrumented. Repeated evaluations at the same x are
+    answered from a cache of 'cachesize' values (a keyword argument,
+    default 128). Returns a RootResult.
+    """
+    g = Instrumented(f, kwargs.pop("cachesize", 128))
+    result = method(g, *args, **kwargs)
+
+    return RootResult(result, g)
+
+
+def find_all_roots(f, a, b, N=1000, accuracy=1e-10, args=()):
+    """
+    Find all the roots of f in [a, b]. f is sampled on a grid of N slices
+    in one vectorized call, every slice where f changes sign becomes a
+    bracket, and all the brackets are refined together with the Illinois
+    false position method.
+
+    Roots closer together than a slice, and roots where f touches zero
+    without changing sign, are missed. Sign changes at poles are dropped,
+    since f does not become small there. f(x, *args) must work on arrays.
+    Returns the array of roots in increasing order.
+    """
+    x = np.linspace(a, b, N + 1)
+    fx = f(x, *args)
+
+    exact = x[fx == 0]
+    k = np.flatnonzero(fx[:-1] * fx[1:] < 0)    # Slices with a sign change
+
+    roots = fposition_array(f, x[k], x[k + 1], accuracy, args, variant="illinois")[0]
+
+    # At a pole, f at the "root" is larger than at the ends of its slice
+    small = np.abs(f(roots, *args)) <= np.maximum(np.abs(fx[k]), np.abs(fx[k + 1]))
+
+    return np.sort(np.concatenate((exact, roots[small])))
+
+
 def f(x):
     """
     Define a function used to test the root-finding methods
@@ -135,6 +824,36 @@ def test_functions():
         print("WARNING: newton() failed the test.")
         isGood = False
 
+    # Test Newton's method with automatic derivatives, and Halley's method
+    root = newton_auto(f, 0, 1e-10)[0]
+    if abs(root - 0.0337652429) > 1e-10:
+        print("WARNING: newton_auto() failed the test.")
+        isGood = False
+
+    root = halley(f, 0, 1e-10)[0]
+    if abs(root - 0.0337652429) > 1e-10:
+        print("WARNING: halley() failed the test.")
+        isGood = False
+
+    # Test the automatic derivatives against the hand-written one
+    x = np.linspace(0, 1, 11)
+    if np.max(np.abs(derivatives(f, x)[1] - dfdx(x))) > 1e-9:
+        print("WARNING: derivatives() failed the test.")
+        isGood = False
+
+    # Powers 0 and 1 must also work at x = 0
+    for x in [0.0, np.zeros(3)]:
+        parts = np.reshape(derivatives(lambda x: x**0 + 3*x**1 + x**2, x), (3, -1))
+        if np.any(parts != [[1.0], [3.0], [2.0]]):
+            print("WARNING: derivatives() failed the x = 0 test.")
+            isGood = False
+
+    # Integer points, and abs()
+    parts = derivatives(lambda x: x**-1 + abs(x - 2) + np.abs(x - 2), np.arange(1, 4))
+    if np.max(np.abs(np.array(parts) - [[3, 0.5, 7/3], [-3, -0.25, 17/9], [2, 0.25, 2/27]])) > 1e-14:
+        print("WARNING: derivatives() failed the integer and abs() test.")
+        isGood = False
+
     # Test secant method
     root = secant(f, 0, 0.05, 1e-10)[0]
     if abs(root - 0.0337652429) > 1e-10:
@@ -153,6 +872,68 @@ def test_functions():
         print("WARNING: fposition() failed the test.")
         isGood = False
 
+    # Test Brent's method and the Illinois and Anderson-Bjorck methods
+    root = brent(f, 0, .05, 1e-10)[0]
+    if abs(root - 0.0337652429) > 1e-10:
+        print("WARNING: brent() failed the test.")
+        isGood = False
+
+    for variant in ["illinois", "anderson-bjorck"]:
+        root = fposition_illinois(f, 0, .05, 1e-10, variant)[0]
+        if abs(root - 0.0337652429) > 1e-10:
+            print("WARNING: fposition_illinois() failed the ", variant, " test.", sep="")
+            isGood = False
+
+    # Test the instrumentation, false position asks for f(a) and f(b) repeatedly
+    result = instrumented(fposition, f, 0, .05, 1e-10)
+    if abs(result.root - 0.0337652429) > 1e-10 or result.evaluations + result.hits != result.calls \
+            or result.hits == 0:
+        print("WARNING: instrumented() failed the test.")
+        isGood = False
+
+    # The Newton-family methods call f with Dual numbers
+    result = instrumented(newton_auto, f, 0.0)
+    if abs(result.root - 0.0337652429) > 1e-10 or result.evaluations != result.calls:
+        print("WARNING: instrumented() failed the newton_auto test.")
+        isGood = False
+
+    # Test the array methods on x^2 - c = 0 for many values of c
+    c = np.linspace(1, 100, 1000)
+    g = lambda x, c: x**2 - c
+    for method in [bisection_array, secant_array, fposition_array]:
+        roots = method(g, 0, 11, 1e-10, args=(c,))[0]
+        if np.max(np.abs(roots - np.sqrt(c))) > 1e-9:
+            print("WARNING: ", method.__name__, "() failed the test.", sep="")
+            isGood = False
+
+    # An accuracy finer than the float spacing at the root must still stop
+    roots, i = bisection_array(lambda x: x - 1e8 - 0.3, [0.0, 0.0], [2e8, 1.0 + 1e8], 1e-12)
+    if np.max(np.abs(roots - 1e8 - 0.3)) > 1e-7 or np.max(i) >= 1000:
+        print("WARNING: bisection_array() failed the float spacing test.")
+        isGood = False
+
+    # Test the system methods on x^2 + y^2 = 4, e^x + y = 1
+    F = lambda x: np.array([x[0]**2 + x[1]**2 - 4, np.exp(x[0]) + x[1] - 1])
+    for method in [newton_system, broyden]:
+        root = method(F, [1, -1], accuracy=1e-12)[0]
+        if np.max(np.abs(F(root))) > 1e-10:
+            print("WARNING: ", method.__name__, "() failed the test.", sep="")
+            isGood = False
+
+    # Test the system methods on the Rosenbrock system 10(y - x^2) = 0, 1 - x = 0
+    F = lambda x: np.array([10*(x[1] - x[0]**2), 1 - x[0]])
+    for method in [newton_system, broyden]:
+        root = method(F, [-1.2, 1], accuracy=1e-12)[0]
+        if np.max(np.abs(root - 1)) > 1e-10:
+            print("WARNING: ", method.__name__, "() failed the Rosenbrock test.", sep="")
+            isGood = False
+
+    # Test the root scan, the test polynomial has six roots in [0, 1]
+    roots = find_all_roots(f, 0, 1)
+    if len(roots) != 6 or abs(roots[0] - 0.0337652429) > 1e-10:
+        print("WARNING: find_all_roots() failed the test.")
+        isGood = False
+
     if isGood is True:
         print("Module is good.")
 
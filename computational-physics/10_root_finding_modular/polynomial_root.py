@@ -3,7 +3,8 @@
 Plots a given polynomial so you can approximately
 locate the roots. Then after you have seen the graph, it asks you how
 many roots you want to find and where to look for them. Each root is
-located using Newton's method.
+located using Newton's method. For comparison, all the roots in [0, 1]
+are also found automatically by scanning for sign changes.
 
 Leon Hostetler, Mar. 21, 2017
 
@@ -46,6 +47,13 @@ plt.xlabel("x")
 plt.ylabel("P(x)")
 plt.show()
 
+#
+# Find all the roots in [0, 1] automatically
+#
+
+scanned = mmr.find_all_roots(P, 0, 1)
+print("\nScanning [0, 1] finds the roots:", scanned)
+
 #
 # Find the roots
 #
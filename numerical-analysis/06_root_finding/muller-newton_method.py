@@ -4,6 +4,9 @@
 Find all (including complex) roots of a given polynomial by using a combination
 of Newton's method, Muller's method, and polynomial deflation.
 
+For comparison, all the roots are then found at once by Aberth-Ehrlich
+simultaneous iteration (see myPolynomial.py).
+
 Leon Hostetler, Feb. 26, 2017
 
 USAGE: python muller-newton_method.py
@@ -12,6 +15,7 @@ USAGE: python muller-newton_method.py
 from __future__ import division, print_function
 import numpy as np
 import cmath
+import myPolynomial
 
 
 def newtons_method(x, a, tolerance):
@@ -26,13 +30,7 @@ def newtons_method(x, a, tolerance):
 
     while errormet is False:
 
-        fx = 0.0
-        for i in range(len(a)):  # Calculate f(x)
-            fx += a[i]*x**i
-
-        fprimex = 0.0
-        for i in range(1, len(a)):
-            fprimex += i*a[i]*x**(i-1)
+        fx, fprimex = myPolynomial.horner(a, x)[:2]  # f(x) and f'(x) in one pass
 
         x_new = x - fx/fprimex
 
@@ -62,14 +60,8 @@ def mullers_method(x0, x1, x2, coeff, tolerance):
 
     while errorMet is False:
 
-        # Evaluate the polynomial at the three points
-        fx0, fx1, fx2 = 0.0, 0.0, 0.0
-        for i in range(len(coeff)):
-            fx0 += coeff[i] * x0 ** i
-        for i in range(len(coeff)):
-            fx1 += coeff[i] * x1 ** i
-        for i in range(len(coeff)):
-            fx2 += coeff[i] * x2 ** i
+        # Evaluate the polynomial at the three points in one pass
+        fx0, fx1, fx2 = myPolynomial.horner(coeff, np.array([x0, x1, x2]))[0]
 
         # Construct the interpolating quadratic
         a = ((fx2-fx1)/(x2-x1)-(fx1-fx0)/(x1-x0))/(x2-x0)
@@ -126,6 +118,7 @@ coefficients = np.array([1.0, 0.0, 0.0, 0.0, 1.0])  # Has complex roots
 #coefficients = np.array([0.001, 1000, 0.001])  # Has complex roots
 
 coefficients2 = np.copy(coefficients)
+coefficients3 = np.copy(coefficients)
 
 Tol = 1.0e-10
 
@@ -166,3 +159,7 @@ while k >= 1:
     B = deflate_polynomial(coefficients2, root)
     coefficients2 = B
     k -= 1
+
+# Find all the roots at once
+print("\nAll roots at once by Aberth-Ehrlich iteration:")
+print(myPolynomial.polynomial_roots(coefficients3, "aberth"))
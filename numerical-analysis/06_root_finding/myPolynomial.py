@@ -0,0 +1,177 @@
+#! /usr/bin/env python
+"""
+This module finds all the roots (including complex) of a polynomial at once,
+instead of one at a time with deflation. The roots are either the
+eigenvalues of the companion matrix, or are found together by Aberth-Ehrlich
+simultaneous iteration. Either way, they can be polished with a few Newton
+steps against the original coefficients.
+
+The coefficients are ordered starting with the zero order term as in
+    f(x) = a_0 + a_1x^1 + a_2x^2 + ...
+
+USAGE: python myPolynomial.py
+
+"""
+from __future__ import division, print_function
+import numpy as np
+
+
+def horner(a, x):
+    """
+    Evaluate the polynomial with coefficients a and its first and second
+    derivatives at x in one Horner pass, without computing any powers of x.
+
+    x may be a number or an array. For a batch of polynomials, a[i] is the
+    array of the i-th coefficients of all of them, and broadcasts against
+    x. For example, a of shape (n+1, B, 1) and x of shape (K,) evaluates
+    B polynomials at the same K points. Returns p(x), p'(x) and p''(x).
+    """
+    a = np.asarray(a)
+    x = np.asarray(x)
+    dtype = np.result_type(a, x, float)
+    shape = np.broadcast(a[0], x).shape
+
+    p = np.zeros(shape, dtype) + a[-1]
+    dp = np.zeros(shape, dtype)
+    ddp = np.zeros(shape, dtype)     # Half the second derivative
+
+    for i in range(len(a) - 2, -1, -1):
+        ddp = ddp*x + dp
+        dp = dp*x + p
+        p = p*x + a[i]
+
+    return p, dp, 2*ddp
+
+
+def trim_coefficients(a):
+    """
+    Remove zero coefficients at the top, and at the bottom where each one
+    is a root at x = 0. Returns the trimmed coefficients and the number of
+    zero roots.
+    """
+    a = np.trim_zeros(np.asarray(a, dtype=complex), "b")
+    if len(a) == 0:
+        raise ValueError("The polynomial is identically zero.")
+
+    zeros = len(a) - len(np.trim_zeros(a, "f"))
+
+    return a[zeros:], zeros
+
+
+def companion_roots(a):
+    """
+    Return the roots of the polynomial as the eigenvalues of its companion
+    matrix. The coefficients must be trimmed.
+    """
+    n = len(a) - 1
+    C = np.zeros([n, n], dtype=complex)
+    C[1:, :-1] = np.eye(n - 1)          # Ones below the diagonal
+    C[:, -1] = -a[:-1]/a[-1]            # Last column from the monic polynomial
+
+    return np.linalg.eigvals(C)
+
+
+def aberth_roots(a, tolerance=1e-14, maxiter=500):
+    """
+    Return the roots of the polynomial found together by Aberth-Ehrlich
+    iteration. Every root is corrected by its Newton step, with the other
+    current estimates repelling it so that no two converge to the same
+    root. The coefficients must be trimmed.
+    """
+    n = len(a) - 1
+
+    # Start on a circle that encloses all the roots (Fujiwara bound),
+    # turned off the real axis so no start is at a symmetric point
+    k = np.arange(1, n + 1)
+    radius = 2*np.max(np.abs(a[n - k]/a[-1])**(1/k))
+    z = radius*np.exp(1j*(2*np.pi*np.arange(n)/n + 0.4))
+
+    for iterations in range(maxiter):
+        p, dp = horner(a, z)[:2]
+        ratio = p/dp
+
+        diff = z[:, None] - z[None, :]
+        np.fill_diagonal(diff, 1)       # Avoid dividing by zero on the diagonal
+        repel = np.sum(1/diff, axis=1) - 1
+
+        step = ratio/(1 - ratio*repel)
+        step[p == 0] = 0
+        z -= step
+
+        if np.max(np.abs(step)) <= tolerance*np.max(np.abs(z)):
+            break
+
+    return z
+
+
+def polish_roots(a, z, steps=3):
+    """
+    Improve the roots with a few Newton steps against the coefficients a.
+    A step is only kept if it reduces |p(z)|.
+    """
+    for k in range(steps):
+        p, dp = horner(a, z)[:2]
+        ok = dp != 0
+        znew = np.where(ok, z - p/np.where(ok, dp, 1), z)
+        better = np.abs(horner(a, znew)[0]) < np.abs(p)
+        z = np.where(better, znew, z)
+
+    return z
+
+
+def polynomial_roots(coefficients, method="companion", polish=True):
+    """
+    Return all the roots (including complex) of a polynomial, sorted by
+    real part. Takes the ordered coefficients, the method ("companion" or
+    "aberth"), and whether to polish the roots with Newton's method
+    against the original coefficients.
+    """
+    a, zeros = trim_coefficients(coefficients)
+
+    if len(a) == 1:
+        z = np.zeros(0, dtype=complex)
+    elif method == "companion":
+        z = companion_roots(a)
+    elif method == "aberth":
+        z = aberth_roots(a)
+    else:
+        raise ValueError('Unknown method "' + str(method) + '", use "companion" or "aberth".')
+
+    if polish is True and len(z) > 0:
+        z = polish_roots(a, z)
+
+    z = np.concatenate((np.zeros(zeros, dtype=complex), z))
+
+    return z[np.lexsort((z.imag, z.real))]
+
+
+# TEST BLOCK
+# Compare both methods on polynomials with known roots.
+if __name__ == '__main__':
+
+    # Roots at 1, 2, ..., 10
+    product = np.polynomial.polynomial.polyfromroots(np.arange(1, 11))
+
+    # x^100 - 1 has the 100th roots of unity as roots
+    unity = np.zeros(101)
+    unity[0], unity[100] = -1.0, 1.0
+
+    for method in ["companion", "aberth"]:
+        roots = polynomial_roots(product, method)
+        print(method, ": (x-1)(x-2)...(x-10) max error = ",
+              np.max(np.abs(roots - np.arange(1, 11))), sep="")
+
+        roots = polynomial_roots(unity, method)
+        print(method, ": x^100 - 1 max |z^100 - 1| = ",
+              np.max(np.abs(roots**100 - 1)), sep="")
+
+    # Check the Horner kernel on a batch of two polynomials at three points:
+    # 1 + 2x + 3x^2 and x^3
+    batch = np.array([[1.0, 0.0], [2.0, 0.0], [3.0, 0.0], [0.0, 1.0]])[:, :, None]
+    x = np.array([0.0, 1.0, 2.0])
+    p, dp, ddp = horner(batch, x)
+    exact = (np.array([1 + 2*x + 3*x**2, x**3]), np.array([2 + 6*x, 3*x**2]),
+             np.array([6 + 0*x, 6*x]))
+    print("Horner kernel max error = ",
+          max(np.max(np.abs(p - exact[0])), np.max(np.abs(dp - exact[1])),
+              np.max(np.abs(ddp - exact[2]))), sep="")
@@ -4,6 +4,9 @@ Finds all the roots of a given polynomial. The first root
 is found using Newton's method, then the polynomial is deflated and the
 process is repeated until all the roots are found.
 
+For comparison, all the roots are then found at once from the eigenvalues
+of the companion matrix (see myPolynomial.py).
+
 Leon Hostetler, Feb. 26, 2017
 
 USAGE: python newtons_method_all_roots.py
@@ -11,6 +14,7 @@ USAGE: python newtons_method_all_roots.py
 """
 from __future__ import division, print_function
 import numpy as np
+import myPolynomial
 
 
 def newtons_method(x, a, tolerance):
@@ -25,13 +29,7 @@ def newtons_method(x, a, tolerance):
 
     while errormet is False:
 
-        fx = 0.0
-        for i in range(len(a)):  # Calculate f(x)
-            fx += a[i]*x**i
-
-        fprimex = 0.0
-        for i in range(1, len(a)):
-            fprimex += i*a[i]*x**(i-1)
+        fx, fprimex = myPolynomial.horner(a, x)[:2]  # f(x) and f'(x) in one pass
 
         x_new = x - fx/fprimex
 
@@ -74,6 +72,8 @@ coefficients = np.array([0.0, 13.125, 0.0, -78.75, 0.0, 86.625])  # P_6'(x)
 #coefficients = np.array([1.0, 0.0, 0.0, 1.0])  # Has complex roots
 #coefficients = np.array([0.001, 1000, 0.001])  # Has complex roots
 
+original = np.copy(coefficients)  # The deflation below overwrites coefficients
+
 k = len(coefficients) - 1
 Tol = 1.0e-10
 
@@ -90,3 +90,7 @@ while k >= 1:
     B = deflate_polynomial(coefficients, root)
     coefficients = B
     k -= 1
+
+# Find all the roots at once
+print("\nAll roots at once from the companion matrix:")
+print(myPolynomial.polynomial_roots(original))